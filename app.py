@@ -1,8 +1,5 @@
 import streamlit as st
-import pandas as pd
 import json
-import plotly.graph_objects as go
-import plotly.express as px
 import numpy as np
 import os
 import sys
@@ -10,12 +7,97 @@ import sys
 # Ensure local modules can be imported
 sys.path.append(os.path.dirname(__file__))
 
-from llm_verification.collector import collect_openai
-from llm_verification.analyzer_benford import extract_numbers_from_text, first_digits, benford_chi_squared
-from llm_verification.analyzer_zipf import zipf_stats
+# plotly, scipy and the collector/analyzer modules are imported lazily (inside
+# the helpers below and the run block) so the page opens without paying for them
 
 st.set_page_config(page_title="LLM Verifier", layout="wide")
 
+
+@st.cache_resource
+def _semantic_cache():
+    from llm_verification.semantic_cache import SemanticCache
+    # shared across sessions; near-duplicate prompts reuse earlier responses
+    return SemanticCache(os.path.join(os.path.dirname(__file__), "data", "llm_cache.npz"))
+
+
+@st.cache_resource
+def _disk_cache():
+    from llm_verification.disk_cache import DiskCache
+    # exact-match responses that survive restarts and are shared between workers
+    return DiskCache(os.path.join(os.path.dirname(__file__), "data", "llm_cache.sqlite"), ttl=7 * 24 * 3600)
+
+
+# the disk cache is only a speed-up: a read-only data/ dir or a locked or
+# corrupt database counts as a miss rather than a failed generation
+def _disk_cache_get(key):
+    try:
+        cached = _disk_cache().get(key)
+        return json.loads(cached) if cached is not None else None
+    except Exception:
+        return None
+
+
+def _disk_cache_put(key, value):
+    try:
+        _disk_cache().put(key, value)
+    except Exception:
+        pass
+
+
+class _CollectFailed(Exception):
+    """Carries a failed record out of _cached_collect.
+
+    st.cache_data doesn't store calls that raise, so the next click retries
+    instead of being served the cached error.
+    """
+
+    def __init__(self, record):
+        super().__init__(record.get('error'))
+        self.record = record
+
+
+@st.cache_data(ttl=3600, show_spinner=False)
+def _cached_collect(model, prompt, temperature):
+    from llm_verification.collector import collect_openai
+    # identical (model, prompt, temperature) re-runs are served from the
+    # Streamlit cache instead of paying for another API round-trip;
+    # on a miss, fall back to the embedding-similarity cache
+    try:
+        cache = _semantic_cache()
+    except Exception:
+        # e.g. an unreadable cache file: generate without the speed-up
+        results = collect_openai([prompt], model=model, temperature=temperature)
+    else:
+        results = [cache.get_or_compute(prompt, model, temperature, compute_fn=collect_openai)]
+    if results and results[0].get('error'):
+        raise _CollectFailed(results[0])
+    return results
+
+
+# Analysis is a pure function of the response text, so reruns triggered by
+# widget interaction (or a cached API response) don't redo it
+@st.cache_data(show_spinner=False)
+def _analyze_benford(text):
+    from llm_verification.analyzer_benford import extract_numbers_from_text, first_digits, benford_chi_squared
+    nums = extract_numbers_from_text(text)
+    if not nums:
+        return nums, None
+    return nums, benford_chi_squared(first_digits(nums))
+
+
+_MIN_ZIPF_WORDS = 50
+
+
+@st.cache_data(show_spinner=False)
+def _analyze_zipf(text):
+    from llm_verification.analyzer_zipf import tokenize, zipf_stats_from_tokens
+    # one tokenization serves both the word-count check and the fit
+    tokens = tokenize(text)
+    if len(tokens) < _MIN_ZIPF_WORDS:
+        return len(tokens), None
+    return len(tokens), zipf_stats_from_tokens(tokens)
+
+
 st.title("LLM Verification Dashboard")
 st.markdown("""
 This dashboard verifies whether LLM-generated outputs conform to natural statistical laws:
@@ -36,6 +118,9 @@ with st.sidebar:
     
     # Temperature is now supported
     temperature = st.slider("Temperature", 0.0, 2.0, 1.0, help="Values > 1.2 may cause hallucinations or formatting errors.")
+
+    # Samples at temperature > 0 are not deterministic, so allow forcing a fresh call
+    bypass_cache = st.checkbox("Bypass response cache", value=False, help="Always query the API, even if this prompt/model/temperature was run before.")
     
     st.markdown("---")
     with st.expander("ℹ️ About the Laws"):
@@ -65,13 +150,30 @@ with st.sidebar:
     run_btn = st.button("Generate & Verify", type="primary")
 
 if run_btn:
+    import plotly.graph_objects as go
+    from llm_verification.collector import collect_openai
+    from llm_verification.disk_cache import make_key
+
     if not os.environ.get("OPENAI_API_KEY"):
         st.error("Please provide an OpenAI API Key in the sidebar.")
     else:
         with st.spinner(f"Requesting data from {model}..."):
             try:
-                # Collect data with temperature
-                results = collect_openai([prompt], model=model, temperature=temperature)
+                # Collect data with temperature (cached unless bypassed)
+                if bypass_cache:
+                    results = collect_openai([prompt], model=model, temperature=temperature)
+                else:
+                    cache_key = make_key(model, prompt, temperature)
+                    cached = _disk_cache_get(cache_key)
+                    if cached is not None:
+                        results = [cached]
+                    else:
+                        try:
+                            results = _cached_collect(model, prompt, temperature)
+                        except _CollectFailed as e:
+                            results = [e.record]
+                        if results and results[0].get('response') and not results[0].get('error'):
+                            _disk_cache_put(cache_key, json.dumps(results[0], ensure_ascii=False))
                 
                 if not results:
                     st.error("No results returned.")
@@ -98,14 +200,13 @@ if run_btn:
 
                         if run_benford:
                             st.markdown("### Benford's Law Analysis")
-                            nums = extract_numbers_from_text(response_text)
+                            nums, benford_result = _analyze_benford(response_text)
                             st.caption(f"Found {len(nums)} numbers")
                             
                             if len(nums) == 0:
                                 st.error("No numbers found in the text.")
                             else:
-                                fd = first_digits(nums)
-                                chi2, p, counts, expected = benford_chi_squared(fd)
+                                chi2, p, counts, expected = benford_result
                                 
                                 # Store for report
                                 benford_data = {"chi2": float(chi2), "p_value": float(p)}
@@ -127,15 +228,10 @@ if run_btn:
                                         st.success("✅ **Pass**: The distribution conforms to Benford's Law.")
                                 
                                 # Plot
-                                df_b = pd.DataFrame({
-                                    "Digit": list(range(1, 10)),
-                                    "Observed": counts,
-                                    "Expected": expected
-                                })
-                                
+                                digits = np.arange(1, 10)
                                 fig_b = go.Figure()
-                                fig_b.add_trace(go.Bar(x=df_b["Digit"], y=df_b["Observed"], name="Observed", marker_color='#636EFA'))
-                                fig_b.add_trace(go.Scatter(x=df_b["Digit"], y=df_b["Expected"], name="Expected", line=dict(color='red', width=3)))
+                                fig_b.add_trace(go.Bar(x=digits, y=counts, name="Observed", marker_color='#636EFA'))
+                                fig_b.add_trace(go.Scatter(x=digits, y=expected, name="Expected", line=dict(color='red', width=3)))
                                 fig_b.update_layout(
                                     title="Leading Digit Distribution",
                                     xaxis_title="First Digit",
@@ -149,13 +245,13 @@ if run_btn:
                             st.markdown("### Zipf's Law Analysis")
                             
                             # Check if text has enough words
-                            words = response_text.split()
-                            if len(words) < 50:
+                            n_words, zipf_result = _analyze_zipf(response_text)
+                            if zipf_result is None:
                                 st.warning("Not enough text content for Zipf analysis (mostly numbers).")
                                 slope, r2 = 0.0, 0.0 # Default dummy values
                             else:
-                                ranks, freqs, slope, r2 = zipf_stats([response_text])
-                                total_words = sum(freqs)
+                                ranks, freqs, slope, r2 = zipf_result
+                                total_words = n_words
                                 
                                 # Store for report
                                 zipf_data = {"slope": float(slope), "r_squared": float(r2)}
@@ -163,7 +259,7 @@ if run_btn:
                                 c1, c2, c3 = st.columns(3)
                                 c1.metric("Zipf Slope", f"{slope:.2f}")
                                 c2.metric("Fit (R²)", f"{r2:.2f}")
-                                c3.metric("Word Count", f"{len(words)}")
+                                c3.metric("Word Count", f"{n_words}")
 
                                 if total_words < 500:
                                     st.warning(f"⚠️ **Inconclusive**: Text too short ({total_words} words). Need >500 words.")
@@ -177,18 +273,19 @@ if run_btn:
                                     st.success("✅ **Pass**: Natural linguistic structure detected.")
                                 
                                 if len(ranks) > 1:
-                                    df_z = pd.DataFrame({
-                                        "LogRank": np.log(ranks),
-                                        "LogFreq": np.log(freqs)
-                                    })
-                                    
-                                    fig_z = px.scatter(df_z, x="LogRank", y="LogFreq", title="Word Frequency (Log-Log)")
-                                    
+                                    # plain float32 arrays: half the payload of float64 and no DataFrame copy
+                                    log_r = np.log(ranks).astype(np.float32)
+                                    log_f = np.log(freqs).astype(np.float32)
+
+                                    fig_z = go.Figure(go.Scattergl(x=log_r, y=log_f, mode='markers', name='Words'))
+                                    fig_z.update_layout(title="Word Frequency (Log-Log)", xaxis_title="LogRank", yaxis_title="LogFreq")
+
                                     # Add regression line
-                                    x_range = np.linspace(min(df_z["LogRank"]), max(df_z["LogRank"]), 100)
-                                    y_pred = slope * x_range + (np.mean(df_z["LogFreq"]) - slope * np.mean(df_z["LogRank"]))
+                                    x_range = np.linspace(log_r.min(), log_r.max(), 100, dtype=np.float32)
+                                    intercept = log_f.mean() - slope * log_r.mean()
+                                    y_pred = slope * x_range + intercept
                                     fig_z.add_trace(go.Scatter(x=x_range, y=y_pred, mode='lines', name='Fit'))
-                                    
+
                                     st.plotly_chart(fig_z, use_container_width=True)
                                 else:
                                     st.warning("Not enough text for Zipf analysis.")
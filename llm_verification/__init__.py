@@ -5,4 +5,6 @@ __all__ = [
     "collector",
     "analyzer_benford",
     "analyzer_zipf",
+    "semantic_cache",
+    "disk_cache",
 ]
@@ -1,48 +1,147 @@
 import re
-import math
-from collections import Counter
+import unicodedata
 from typing import List, Tuple
 import numpy as np
-from scipy.stats import chisquare
+from scipy.special import chdtrc
 
 DIGIT_RE = re.compile(r"(?<!\d)(?:\d{1,3}(?:,\d{3})*|\d+)(?:\.\d+)?(?!\d)")
+# DIGIT_RE plus the NUL text separator, see first_digits_by_text
+_DIGIT_OR_SEP_RE = re.compile(DIGIT_RE.pattern + '|\x00')
+
+# P(d) = log10(1 + 1/d) for d = 1..9; read-only since it is shared by every caller
+_BENFORD_P = np.log10(1.0 + 1.0 / np.arange(1, 10, dtype=np.float64))
+_BENFORD_P.setflags(write=False)
 
 
 def extract_numbers_from_text(s: str) -> List[str]:
     return DIGIT_RE.findall(s)
 
 
-def first_digits(numbers: List[str]) -> List[int]:
-    out = []
-    for n in numbers:
-        n2 = n.replace(',', '')
-        if n2.startswith('0') and '.' in n2:
-            # leading zero decimal like 0.023 -> first non-zero digit
-            s = n2.lstrip('0.')
-            if s:
-                out.append(int(s[0]))
-        else:
-            # integer or non-leading-zero decimal
-            s = n2.lstrip('0')
-            if s:
-                out.append(int(s[0]))
-    return out
+def extract_numbers_from_texts(texts: List[str]) -> List[str]:
+    # one findall over the whole batch instead of one per text; NUL is not a
+    # digit, so DIGIT_RE's lookarounds keep numbers from spanning two texts
+    return DIGIT_RE.findall('\x00'.join(texts))
+
+
+def _leading_digits(buf: np.ndarray, starts: np.ndarray, ends: np.ndarray) -> np.ndarray:
+    # buf holds the tokens back to back as code points; find every significant
+    # digit and exponent marker in a single scan, then map each token to its
+    # first ones with searchsorted. 0 marks a token without a significant digit
+    sig = np.flatnonzero((buf >= ord('1')) & (buf <= ord('9')))
+    exp = np.flatnonzero((buf == ord('e')) | (buf == ord('E')))
+    pos = np.append(sig, buf.size)[np.searchsorted(sig, starts)]
+    stop = np.minimum(ends, np.append(exp, buf.size)[np.searchsorted(exp, starts)])
+    has = pos < stop
+    d = np.zeros(starts.size, dtype=np.int64)
+    d[has] = buf[pos[has]].astype(np.int64) - ord('0')
+    return d
+
+
+def _token_offsets(tokens: List[str]) -> Tuple[np.ndarray, np.ndarray]:
+    lens = np.fromiter(map(len, tokens), dtype=np.int64, count=len(tokens))
+    ends = np.cumsum(lens)
+    return ends - lens, ends
+
+
+def _code_points(s: str) -> np.ndarray:
+    # one element per code point: bytes for ASCII text, UTF-32 otherwise.
+    # Non-ASCII decimal digits (which \d matches, e.g. Arabic-Indic '٣') are
+    # mapped to their ASCII digit first so they count like the ASCII ones
+    if s.isascii():
+        return np.frombuffer(s.encode('ascii'), dtype=np.uint8)
+    s = s.translate({ord(c): str(unicodedata.decimal(c)) for c in set(s) if not c.isascii() and c.isdecimal()})
+    return np.frombuffer(s.encode('utf-32-le', 'surrogatepass'), dtype=np.uint32)
+
+
+def _first_digits_from_strings(numbers: List[str]) -> np.ndarray:
+    # concatenate the tokens into one code-point buffer with start/end offsets
+    buf = _code_points(''.join(numbers))
+    starts, ends = _token_offsets(numbers)
+    d = _leading_digits(buf, starts, ends)
+    return d[d > 0]
+
+
+def first_digits(numbers: List[str]) -> np.ndarray:
+    """Return the leading (first non-zero) digit of each number as an int array.
+
+    Accepts numeric strings (as returned by extract_numbers_from_text) or
+    floats; zeros, NaN and inf are dropped. Strings are read digit by digit,
+    which is exact and skips float parsing; a float's digit is the first one
+    of ``format(x, '.15g')``.
+    """
+    if isinstance(numbers, (list, tuple)) and numbers and isinstance(numbers[0], str):
+        # str() is a no-op on strings and also covers mixed str/float lists
+        return _first_digits_from_strings(list(map(str, numbers)))
+    a = np.asarray(numbers)
+    if a.dtype.kind in 'US':
+        return _first_digits_from_strings(a.astype(str).ravel().tolist())
+    a = a.astype(np.float64)
+    a = np.abs(a[np.isfinite(a) & (a != 0)])
+    if a.size == 0:
+        return np.zeros(0, dtype=np.int64)
+    # subnormals: scale into the normal range first so 10.0 ** exp stays finite
+    scaled = a.copy()
+    scaled[scaled < 1e-300] *= 1e300
+    exp = np.floor(np.log10(scaled))
+    m = scaled / 10.0 ** exp
+    # log10 can be off by one right at a power of ten
+    m = np.where(m < 1, m * 10, m)
+    m = np.where(m >= 10, m / 10, m)
+    # round the mantissa to 15 significant digits, as format(x, '.15g') does:
+    # this absorbs the few ulps of error from log10/division (0.3 -> 2.999...)
+    # without moving genuine 15-digit values such as 6.99999999999999
+    d = np.floor(np.round(m, 14)).astype(np.int64)
+    # that error can still decide the rounding when the 16th+ digits sit
+    # right below a digit boundary (4.999999999999995e58); those rare values
+    # are read from their '.14e' form (the digits of '.15g'), which rounds the
+    # exact binary value
+    slack = 16 * np.finfo(np.float64).eps
+    unsure = np.flatnonzero(np.floor(np.round(m * (1 - slack), 14)) != np.floor(np.round(m * (1 + slack), 14)))
+    if unsure.size:
+        d[unsure] = [int(f'{x:.14e}'[0]) for x in a[unsure].tolist()]
+    # mantissas that round up to 10 (1e23 is stored as 9.99...e22) lead with 1
+    d[d == 10] = 1
+    return d
+
+
+def first_digits_by_text(texts: List[str]) -> Tuple[np.ndarray, List[np.ndarray]]:
+    """Batched ``extract_numbers_from_text`` + ``first_digits`` for many texts.
+
+    Returns the number of extracted numbers in each text and, per text, the
+    array ``first_digits(extract_numbers_from_text(text))`` would give. One
+    regex pass covers all texts; NUL separators are matched as tokens of
+    their own so every number can be traced back to its text.
+    """
+    if not texts:
+        return np.zeros(0, dtype=np.int64), []
+    # a NUL inside a text would read as a boundary and shift every later text;
+    # any non-digit stand-in leaves DIGIT_RE's matches unchanged
+    tokens = _DIGIT_OR_SEP_RE.findall('\x00'.join(t.replace('\x00', ' ') for t in texts))
+    buf = _code_points(''.join(tokens))
+    starts, ends = _token_offsets(tokens)
+    sep = buf[starts] == 0 if starts.size else np.zeros(0, dtype=bool)
+    text_id = np.cumsum(sep)
+    n_numbers = np.bincount(text_id[~sep], minlength=len(texts))
+    d = _leading_digits(buf, starts, ends)
+    keep = ~sep & (d > 0)
+    ids = text_id[keep]
+    fds = np.split(d[keep], np.searchsorted(ids, np.arange(1, len(texts))))
+    return n_numbers, fds
 
 
 def benford_expected() -> np.ndarray:
-    return np.array([math.log10(1 + 1 / d) for d in range(1, 10)])
+    return _BENFORD_P
 
 
 def benford_chi_squared(first_digits_list: List[int]) -> Tuple[float, float, np.ndarray, np.ndarray]:
-    counts = np.array([
-        Counter(first_digits_list).get(d, 0) for d in range(1, 10)
-    ])
+    counts = np.bincount(np.asarray(first_digits_list, dtype=np.int64), minlength=10)[1:10]
     total = counts.sum()
     if total == 0:
         raise ValueError('No digits to analyze')
-    expected_prop = benford_expected()
-    expected = expected_prop * total
-    chi2, p = chisquare(counts, f_exp=expected)
+    expected = total * _BENFORD_P
+    chi2 = float(((counts - expected) ** 2 / expected).sum())
+    # chdtrc is the chi-square survival function without the rv_continuous wrapper
+    p = float(chdtrc(8, chi2))
     return chi2, p, counts, expected
 
 
@@ -56,10 +155,7 @@ if __name__ == '__main__':
         r = rec.get('response')
         if r:
             all_texts.append(r)
-    nums = []
-    for t in all_texts:
-        nums.extend(extract_numbers_from_text(t))
-    fd = first_digits(nums)
+    fd = first_digits(extract_numbers_from_texts(all_texts))
     chi2, p, counts, expected = benford_chi_squared(fd)
     print('chi2=', chi2, 'p=', p)
     print('counts=', counts)
@@ -1,29 +1,71 @@
+import re as _re
 import regex as re
 from collections import Counter
 from typing import List, Tuple
 import numpy as np
-from scipy import stats
 
 WORD_RE = re.compile(r"[\p{L}']+", re.UNICODE)
+# for ASCII-only text (most LLM output) the Unicode letter class reduces to
+# [a-z] after lowercasing, which the stdlib engine matches about twice as fast
+ASCII_WORD_RE = _re.compile(r"[a-z']+")
 
 
 def tokenize(s: str) -> List[str]:
-    # lowercase and simple tokenization
-    return [w.lower() for w in WORD_RE.findall(s)]
+    # lowercase once, then let the C regex engine do the splitting
+    s = s.lower()
+    if s.isascii():
+        return ASCII_WORD_RE.findall(s)
+    return WORD_RE.findall(s)
 
 
-def zipf_stats(texts: List[str]) -> Tuple[List[int], List[int], float]:
-    tokens = []
+def loglog_fit(freqs: np.ndarray) -> Tuple[float, float, float]:
+    """Fit log(freq) = slope * log(rank) + intercept for rank-ordered ``freqs``.
+
+    Returns (slope, intercept, r2) from the closed-form least-squares solution.
+    """
+    x = np.log(np.arange(1, len(freqs) + 1))
+    y = np.log(freqs)
+    xm = x.mean()
+    ym = y.mean()
+    # centring first avoids the cancellation of raw sums of squares
+    dx = x - xm
+    dy = y - ym
+    sxy = dx @ dy
+    sxx = dx @ dx
+    syy = dy @ dy
+    slope = sxy / sxx
+    r2 = sxy * sxy / (sxx * syy) if syy > 0 else 0.0
+    return float(slope), float(ym - slope * xm), float(r2)
+
+
+def rank_frequencies(counts: Counter) -> np.ndarray:
+    # only the frequencies matter for the fit, so rank them with a NumPy sort
+    # instead of ordering (word, freq) pairs with most_common()
+    freqs = np.fromiter(counts.values(), dtype=np.int64, count=len(counts))
+    # sort the fresh buffer in place rather than have np.sort copy it
+    freqs.sort()
+    return freqs[::-1]
+
+
+def _zipf_from_counts(counts: Counter) -> Tuple[np.ndarray, np.ndarray, float, float]:
+    freqs = rank_frequencies(counts)
+    ranks = np.arange(1, freqs.size + 1)
+    if freqs.size < 2:
+        raise ValueError('Need at least two distinct words for a Zipf fit')
+    slope, _, r2 = loglog_fit(freqs)
+    return ranks, freqs, slope, r2
+
+
+def zipf_stats_from_tokens(tokens: List[str]) -> Tuple[np.ndarray, np.ndarray, float, float]:
+    """Same as zipf_stats, for callers that already tokenized the text."""
+    return _zipf_from_counts(Counter(tokens))
+
+
+def zipf_stats(texts: List[str]) -> Tuple[np.ndarray, np.ndarray, float, float]:
+    counts = Counter()
     for t in texts:
-        tokens.extend(tokenize(t))
-    counts = Counter(tokens)
-    freqs = sorted(counts.values(), reverse=True)
-    ranks = list(range(1, len(freqs)+1))
-    # fit a power-law on log-log
-    log_r = np.log(ranks)
-    log_f = np.log(freqs)
-    slope, intercept, r_value, p_value, std_err = stats.linregress(log_r, log_f)
-    return ranks, freqs, slope, r_value**2
+        counts.update(tokenize(t))
+    return _zipf_from_counts(counts)
 
 
 if __name__ == '__main__':
@@ -35,6 +77,6 @@ if __name__ == '__main__':
         r = rec.get('response')
         if r:
             all_texts.append(r)
-    ranks, freqs, slope = zipf_stats(all_texts)
-    print('slope=', slope)
+    ranks, freqs, slope, r2 = zipf_stats(all_texts)
+    print('slope=', slope, 'r2=', r2)
     print('top 20 ranks/freqs=', list(zip(ranks[:20], freqs[:20])))
@@ -1,7 +1,9 @@
 import os
 import json
 import time
-from typing import List, Iterable, Dict
+import asyncio
+from contextlib import nullcontext
+from typing import List, Iterable, Dict, Optional
 from .utils import read_jsonl
 from concurrent.futures import ThreadPoolExecutor, as_completed
 
@@ -12,9 +14,10 @@ def load_from_jsonl(path: str) -> List[dict]:
 
 def save_jsonl(path: str, records: Iterable[Dict]):
     """Append records to a JSONL file."""
+    # serialize the whole batch first so it goes out in a single write
+    payload = ''.join(json.dumps(r, ensure_ascii=False) + '\n' for r in records)
     with open(path, 'a', encoding='utf-8') as f:
-        for r in records:
-            f.write(json.dumps(r, ensure_ascii=False) + '\n')
+        f.write(payload)
 
 
 def collect_openai(prompts: List[str], model: str = 'gpt-4o', api_key_env: str = 'OPENAI_API_KEY',
@@ -83,9 +86,10 @@ def collect_openai(prompts: List[str], model: str = 'gpt-4o', api_key_env: str =
 
 
 def collect_from_prompts_file(prompts_path: str) -> List[str]:
+    # one read + split; text mode keeps universal-newline handling
     with open(prompts_path, 'r', encoding='utf-8') as f:
-        lines = [line.strip() for line in f if line.strip() and not line.strip().startswith('#')]
-    return lines
+        text = f.read()
+    return [ln for ln in (line.strip() for line in text.split('\n')) if ln and not ln.startswith('#')]
 
 
 def _collect_single(client, prompt: str, model: str, temperature: float) -> dict:
@@ -118,8 +122,13 @@ def _collect_single(client, prompt: str, model: str, temperature: float) -> dict
 
 
 def collect_openai_parallel(prompts: List[str], model: str = 'gpt-4o', api_key_env: str = 'OPENAI_API_KEY',
-                            max_workers: int = 4, dry_run: bool = False, temperature: float = 1.0) -> List[dict]:
-    """Collect using a ThreadPoolExecutor. For dry_run, returns records quickly without network calls."""
+                            max_workers: int = 4, dry_run: bool = False, temperature: float = 1.0,
+                            executor: Optional[ThreadPoolExecutor] = None) -> List[dict]:
+    """Collect using a ThreadPoolExecutor. For dry_run, returns records quickly without network calls.
+
+    Pass ``executor`` to reuse one pool across several calls instead of
+    starting and joining threads per call (``max_workers`` is then ignored).
+    """
     if dry_run:
         return [{"prompt": p, "response": None, "model": model, "temperature": temperature, "timestamp": time.time()} for p in prompts]
 
@@ -142,7 +151,8 @@ def collect_openai_parallel(prompts: List[str], model: str = 'gpt-4o', api_key_e
     client = OpenAI(api_key=key)
 
     results: List[dict] = []
-    with ThreadPoolExecutor(max_workers=max_workers) as ex:
+    # a caller-owned executor is left running for its next call
+    with nullcontext(executor) if executor is not None else ThreadPoolExecutor(max_workers=max_workers) as ex:
         futures = {
             ex.submit(_collect_single, client, p, model, temperature): p
             for p in prompts
@@ -152,3 +162,71 @@ def collect_openai_parallel(prompts: List[str], model: str = 'gpt-4o', api_key_e
     return results
 
 
+
+
+async def _collect_single_async(client, prompt: str, model: str, temperature: float, sem: asyncio.Semaphore,
+                                max_retries: int, sleep_between: float) -> dict:
+    # client is an AsyncOpenAI() instance; the semaphore bounds in-flight requests
+    attempt = 0
+    while True:
+        attempt += 1
+        try:
+            async with sem:
+                resp = await client.chat.completions.create(
+                    model=model,
+                    messages=[{"role": "user", "content": prompt}],
+                    temperature=temperature,
+                )
+            text = resp.choices[0].message.content
+            # treat empty or whitespace-only responses as transient failures to allow retries
+            if not text or not str(text).strip():
+                raise RuntimeError('empty response')
+            return {"prompt": prompt, "response": text, "model": model, "temperature": temperature, "timestamp": time.time()}
+        except Exception as e:
+            if attempt >= max_retries:
+                return {"prompt": prompt, "response": None, "model": model, "temperature": temperature, "timestamp": time.time(), "error": str(e)}
+            # exponential backoff outside the semaphore so other prompts keep going
+            await asyncio.sleep(min(30.0, sleep_between * 2 ** (attempt - 1)))
+
+
+async def collect_openai_async(prompts: List[str], model: str = 'gpt-4o', api_key_env: str = 'OPENAI_API_KEY',
+                               max_workers: int = 4, max_retries: int = 3, sleep_between: float = 1.0,
+                               dry_run: bool = False, temperature: float = 1.0,
+                               sem: Optional[asyncio.Semaphore] = None) -> List[dict]:
+    """Collect with asyncio, keeping at most ``max_workers`` requests in flight.
+
+    All requests share one thread and event loop; run with
+    ``asyncio.run(collect_openai_async(...))``. Pass ``sem`` to share one
+    concurrency cap between several concurrent calls (``max_workers`` is then
+    ignored). Records are returned in prompt order.
+    """
+    if dry_run:
+        return [{"prompt": p, "response": None, "model": model, "temperature": temperature, "timestamp": time.time()} for p in prompts]
+
+    try:
+        from openai import AsyncOpenAI
+    except Exception:
+        raise RuntimeError('openai package not available in environment; install it to enable API collection')
+
+    # Try to load .env if present
+    try:
+        from dotenv import load_dotenv
+        # Prefer values in project .env over existing environment variables
+        load_dotenv(override=True)
+    except Exception:
+        pass
+
+    key = os.getenv(api_key_env)
+    if not key:
+        raise RuntimeError(f'Please set environment variable {api_key_env}')
+    client = AsyncOpenAI(api_key=key)
+
+    if sem is None:
+        sem = asyncio.Semaphore(max_workers)
+    try:
+        return await asyncio.gather(*(
+            _collect_single_async(client, p, model, temperature, sem, max_retries, sleep_between)
+            for p in prompts
+        ))
+    finally:
+        await client.close()
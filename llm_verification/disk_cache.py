@@ -0,0 +1,70 @@
+"""SQLite-backed LLM response cache that survives dashboard restarts.
+
+Entries are keyed by ``make_key(model, prompt, temperature)``. The least
+recently used entries are evicted once ``max_entries`` is exceeded. Entries
+older than ``ttl`` seconds are never served and are dropped when the cache is
+opened.
+"""
+import os
+import time
+import sqlite3
+import hashlib
+from contextlib import closing
+from typing import Optional
+
+
+def make_key(model: str, prompt: str, temperature: float) -> str:
+    return hashlib.blake2b(f"{model}|{temperature}|{prompt}".encode('utf-8'), digest_size=16).hexdigest()
+
+
+class DiskCache:
+    def __init__(self, path: str = 'data/llm_cache.sqlite', ttl: Optional[float] = None, max_entries: int = 10000):
+        self.path = path
+        self.ttl = ttl
+        self.max_entries = max_entries
+        os.makedirs(os.path.dirname(path) or '.', exist_ok=True)
+        with closing(self._connect()) as conn, conn:
+            conn.execute('PRAGMA journal_mode=WAL')
+            conn.execute(
+                'CREATE TABLE IF NOT EXISTS cache ('
+                'key TEXT PRIMARY KEY, response TEXT, created_at REAL, accessed_at REAL)'
+            )
+            if ttl is not None:
+                conn.execute('DELETE FROM cache WHERE created_at < ?', (time.time() - ttl,))
+
+    def _connect(self) -> sqlite3.Connection:
+        # a connection per operation keeps the cache usable from Streamlit's script threads
+        conn = sqlite3.connect(self.path, timeout=10)
+        conn.execute('PRAGMA synchronous=NORMAL')
+        return conn
+
+    def get(self, key: str) -> Optional[str]:
+        with closing(self._connect()) as conn, conn:
+            if self.ttl is None:
+                row = conn.execute('SELECT response FROM cache WHERE key = ?', (key,)).fetchone()
+            else:
+                # long-lived instances (the dashboard keeps one per process)
+                # must not serve rows that expired after they were opened
+                row = conn.execute('SELECT response FROM cache WHERE key = ? AND created_at >= ?',
+                                   (key, time.time() - self.ttl)).fetchone()
+            if row is None:
+                return None
+            conn.execute('UPDATE cache SET accessed_at = ? WHERE key = ?', (time.time(), key))
+            return row[0]
+
+    def put(self, key: str, response: str):
+        now = time.time()
+        with closing(self._connect()) as conn, conn:
+            conn.execute(
+                'INSERT OR REPLACE INTO cache (key, response, created_at, accessed_at) VALUES (?, ?, ?, ?)',
+                (key, response, now, now),
+            )
+            conn.execute(
+                'DELETE FROM cache WHERE key IN ('
+                'SELECT key FROM cache ORDER BY accessed_at DESC LIMIT -1 OFFSET ?)',
+                (self.max_entries,),
+            )
+
+    def __len__(self):
+        with closing(self._connect()) as conn:
+            return conn.execute('SELECT COUNT(*) FROM cache').fetchone()[0]
@@ -1,6 +1,11 @@
 """Small CLI for batch collection of prompts to JSONL outputs."""
 import argparse
-from .collector import collect_openai, collect_openai_parallel, collect_from_prompts_file, save_jsonl
+import asyncio
+from concurrent.futures import ThreadPoolExecutor
+from contextlib import ExitStack
+from functools import partial
+from .collector import (collect_openai, collect_openai_parallel, collect_openai_async, collect_from_prompts_file,
+                        save_jsonl)
 
 
 def main():
@@ -11,6 +16,7 @@ def main():
     p.add_argument('--topic', type=str, default='', help='Optional topic label to annotate each record as _topic')
     p.add_argument('--dry-run', action='store_true', help='Do not call API, just record prompts')
     p.add_argument('--workers', type=int, default=1, help='Number of worker threads for parallel collection')
+    p.add_argument('--use-async', action='store_true', help='Collect with asyncio, running all models/repetitions of a batch concurrently; --workers bounds in-flight requests per model')
     p.add_argument('--batch-size', type=int, default=0, help='If >0, split prompts into batches of this size')
     p.add_argument('--max-batches', type=int, default=0, help='If >0, stop after processing this many batches')
     p.add_argument('--max-prompts', type=int, default=0, help='If >0, stop after processing this many prompts in total')
@@ -21,36 +27,63 @@ def main():
     prompts = collect_from_prompts_file(args.prompts)
     model_list = [m.strip() for m in args.models.split(',') if m.strip()] if args.models else [args.model]
 
-    def chunks(lst, n):
-        for i in range(0, len(lst), n):
-            yield lst[i:i + n]
+    with ExitStack() as stack:
+        # one thread pool for every batch/model/repetition rather than one per
+        # call; shut down (dropping queued requests) however the run ends
+        pool = None
+        if args.workers > 1 and not args.use_async:
+            pool = ThreadPoolExecutor(max_workers=args.workers)
+            stack.callback(pool.shutdown, cancel_futures=True)
 
-    total_written = 0
-    processed_prompts = 0
-    if args.batch_size and args.batch_size > 0:
-        for i, batch in enumerate(chunks(prompts, args.batch_size), start=1):
-            # enforce max-batches if set
-            if args.max_batches and args.max_batches > 0 and i > args.max_batches:
-                print(f'Reached max-batches limit ({args.max_batches}), stopping.')
-                break
-            # if max-prompts set, possibly trim the last batch so we don't exceed the limit
-            if args.max_prompts and args.max_prompts > 0:
-                remaining = args.max_prompts - processed_prompts
-                if remaining <= 0:
-                    print(f'Reached max-prompts limit ({args.max_prompts}), stopping.')
-                    break
-                if len(batch) > remaining:
-                    batch = batch[:remaining]
-            print(
-                f"Processing batch {i} (size {len(batch)})..."
-            )
+        def collect(batch, model):
+            if pool is not None:
+                return collect_openai_parallel(batch, model=model, dry_run=args.dry_run, executor=pool)
+            return collect_openai(batch, model=model, dry_run=args.dry_run)
+
+        async def collect_all_async(batch):
+            # repetitions of a model share one semaphore so --workers caps each model
+            sems = {m: asyncio.Semaphore(max(1, args.workers)) for m in model_list}
+            return await asyncio.gather(*(
+                collect_openai_async(batch, model=m, dry_run=args.dry_run, sem=sems[m])
+                for m in model_list for _ in range(args.n_per_prompt)
+            ))
+
+        def runs(batch):
+            """Yield (model, rep, get_records) for every model and repetition of a batch.
+
+            With --use-async every pair is collected concurrently up front; otherwise
+            each get_records() call collects that pair on demand.
+            """
+            if args.use_async:
+                results = iter(asyncio.run(collect_all_async(batch)))
             for model in model_list:
                 for rep in range(args.n_per_prompt):
+                    yield model, rep, partial(next, results) if args.use_async else partial(collect, batch, model)
+
+        total_written = 0
+        processed_prompts = 0
+        if args.batch_size and args.batch_size > 0:
+            for i, start in enumerate(range(0, len(prompts), args.batch_size), start=1):
+                # enforce max-batches if set
+                if args.max_batches and args.max_batches > 0 and i > args.max_batches:
+                    print(f'Reached max-batches limit ({args.max_batches}), stopping.')
+                    break
+                end = start + args.batch_size
+                # if max-prompts set, possibly trim the last batch so we don't exceed the limit
+                if args.max_prompts and args.max_prompts > 0:
+                    remaining = args.max_prompts - processed_prompts
+                    if remaining <= 0:
+                        print(f'Reached max-prompts limit ({args.max_prompts}), stopping.')
+                        break
+                    end = min(end, start + remaining)
+                # bounds are settled first so each batch is sliced exactly once
+                batch = prompts[start:end]
+                print(
+                    f"Processing batch {i} (size {len(batch)})..."
+                )
+                for model, rep, get_records in runs(batch):
                     print(f"  model={model} rep={rep+1}/{args.n_per_prompt}")
-                    if args.workers and args.workers > 1:
-                        records = collect_openai_parallel(batch, model=model, max_workers=args.workers, dry_run=args.dry_run)
-                    else:
-                        records = collect_openai(batch, model=model, dry_run=args.dry_run)
+                    records = get_records()
                     # annotate topic if provided
                     if args.topic:
                         for r in records:
@@ -59,14 +92,10 @@ def main():
                     total_written += len(records)
                     processed_prompts += len(batch)
                     print(f"  Appended {len(records)} records (total {total_written})")
-    else:
-        for model in model_list:
-            for rep in range(args.n_per_prompt):
+        else:
+            for model, rep, get_records in runs(prompts):
                 print(f"Collecting for model={model} rep={rep+1}/{args.n_per_prompt}...")
-                if args.workers and args.workers > 1:
-                    records = collect_openai_parallel(prompts, model=model, max_workers=args.workers, dry_run=args.dry_run)
-                else:
-                    records = collect_openai(prompts, model=model, dry_run=args.dry_run)
+                records = get_records()
                 # annotate topic if provided
                 if args.topic:
                     for r in records:
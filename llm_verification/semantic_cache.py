@@ -0,0 +1,140 @@
+"""Embedding-similarity cache for LLM responses.
+
+Near-duplicate prompts (e.g. "500-word sci-fi story about a robot" vs
+"500 word science fiction story on a robot") are served from the cache when
+the cosine similarity of their embeddings exceeds ``threshold`` and the
+model/temperature match exactly.
+"""
+import os
+import json
+import tempfile
+import threading
+from typing import Callable, List, Optional
+import numpy as np
+
+
+def openai_embedder(model: str = 'text-embedding-3-small', api_key_env: str = 'OPENAI_API_KEY') -> Callable[[str], np.ndarray]:
+    """Return a function mapping a prompt to its OpenAI embedding vector."""
+    try:
+        from openai import OpenAI
+    except Exception:
+        raise RuntimeError('openai package not available in environment; install it to enable API collection')
+
+    key = os.getenv(api_key_env)
+    if not key:
+        raise RuntimeError(f'Please set environment variable {api_key_env}')
+    client = OpenAI(api_key=key)
+
+    def embed(text: str) -> np.ndarray:
+        resp = client.embeddings.create(model=model, input=text)
+        return np.asarray(resp.data[0].embedding, dtype=np.float32)
+
+    return embed
+
+
+class SemanticCache:
+    """Prompt -> record cache backed by a float32 embedding matrix.
+
+    Embeddings are stored row-wise in ``E`` (shape ``(n, d)``) with their
+    norms precomputed, so a lookup is a single matrix-vector product.
+    Lookups, additions and saves hold a lock, so one instance can be shared
+    between threads (the dashboard keeps one per server process).
+    """
+
+    def __init__(self, path: Optional[str] = 'data/llm_cache.npz', embed_fn: Optional[Callable[[str], np.ndarray]] = None,
+                 threshold: float = 0.92):
+        self.path = path
+        self.threshold = threshold
+        self._embed_fn = embed_fn
+        # E, norms and entries change together; RLock since add() calls save()
+        self._lock = threading.RLock()
+        self.E = np.zeros((0, 0), dtype=np.float32)
+        self.norms = np.zeros(0, dtype=np.float32)
+        self.entries: List[dict] = []  # parallel to rows of E: {prompt, model, temperature, record}
+        if path and os.path.exists(path):
+            self.load()
+
+    def __len__(self):
+        return len(self.entries)
+
+    def embed(self, text: str) -> np.ndarray:
+        if self._embed_fn is None:
+            # created lazily so that the cache can be constructed without an API key
+            self._embed_fn = openai_embedder()
+        return np.asarray(self._embed_fn(text), dtype=np.float32)
+
+    def _lookup(self, q: np.ndarray, model: str, temperature: float) -> Optional[dict]:
+        qn = float(np.linalg.norm(q))
+        if qn == 0:
+            return None
+        with self._lock:
+            if not self.entries:
+                return None
+            sims = (self.E @ q) / (self.norms * qn)
+            # only entries produced by the same model/temperature are candidates
+            mask = np.array([e['model'] == model and e['temperature'] == temperature for e in self.entries])
+            if not mask.any():
+                return None
+            sims = np.where(mask, sims, -np.inf)
+            best = int(np.argmax(sims))
+            if sims[best] > self.threshold:
+                return self.entries[best]['record']
+        return None
+
+    def get(self, prompt: str, model: str, temperature: float) -> Optional[dict]:
+        return self._lookup(self.embed(prompt), model, temperature)
+
+    def add(self, prompt: str, model: str, temperature: float, record: dict, q: Optional[np.ndarray] = None):
+        if q is None:
+            q = self.embed(prompt)
+        q = q.reshape(1, -1)
+        with self._lock:
+            self.E = q if not self.entries else np.vstack([self.E, q])
+            self.norms = np.append(self.norms, np.float32(np.linalg.norm(q)))
+            self.entries.append({'prompt': prompt, 'model': model, 'temperature': temperature, 'record': record})
+            if self.path:
+                self.save()
+
+    def get_or_compute(self, prompt: str, model: str, temperature: float, compute_fn: Callable[..., List[dict]]) -> dict:
+        """Return a cached record for a similar prompt, or call ``compute_fn``.
+
+        ``compute_fn`` has the signature of ``collector.collect_openai``. Records
+        with an error or an empty response are returned but not cached. If the
+        prompt can't be embedded (no key, rate limit, ...), the cache is
+        bypassed and the record comes straight from ``compute_fn``.
+        """
+        try:
+            q = self.embed(prompt)
+        except Exception:
+            # the cache is only a speed-up; never let it block generation
+            return compute_fn([prompt], model=model, temperature=temperature)[0]
+        hit = self._lookup(q, model, temperature)
+        if hit is not None:
+            return hit
+        record = compute_fn([prompt], model=model, temperature=temperature)[0]
+        if record.get('response') and not record.get('error'):
+            self.add(prompt, model, temperature, record, q=q)
+        return record
+
+    def save(self):
+        d = os.path.dirname(self.path) or '.'
+        os.makedirs(d, exist_ok=True)
+        # write to a unique temp file first so a crash never leaves a truncated
+        # cache and concurrent writers (other processes) never share one
+        with self._lock:
+            fd, tmp = tempfile.mkstemp(dir=d, prefix=os.path.basename(self.path) + '.', suffix='.tmp.npz')
+            try:
+                with os.fdopen(fd, 'wb') as f:
+                    np.savez(f, E=self.E, entries=np.array([json.dumps(e, ensure_ascii=False) for e in self.entries]))
+                os.replace(tmp, self.path)
+            except BaseException:
+                os.unlink(tmp)
+                raise
+
+    def load(self):
+        with np.load(self.path) as data:
+            E = data['E'].astype(np.float32)
+            entries = [json.loads(s) for s in data['entries'].tolist()]
+        self.E = E
+        self.norms = np.linalg.norm(E, axis=1).astype(np.float32) if len(entries) else np.zeros(0, dtype=np.float32)
+        self.entries = entries
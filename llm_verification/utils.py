@@ -1,21 +1,46 @@
 import json
-from typing import Iterator, Dict
+import re
+from functools import lru_cache
+from typing import Iterator, Dict, List, Tuple
+
+try:
+    # optional: several times faster than the stdlib decoder on large collections
+    import orjson
+    _loads = orjson.loads
+except ImportError:
+    _loads = json.loads
+
+# regex for numbers (with optional leading sign and currency), scientific
+# capture group 'num' contains the numeric token possibly with sign/currency
+NUM_RE = re.compile(r"(?<!\w)(?P<num>[-+]?\s*[$€£¥]?\s*(?:\d{1,3}(?:,\d{3})*|\d+)(?:\.\d+)?(?:[eE][+-]?\d+)?)")
+CURRENCY_PREFIX_RE = re.compile(r'^[\$€£¥]+')
+NON_NUMERIC_RE = re.compile(r'[^0-9eE+\-\.]')
+WHITESPACE_RE = re.compile(r"\s+")
 
 
 def read_jsonl(path: str) -> Iterator[Dict]:
     """Read a JSONL file robustly.
 
-    This function tolerates multiple JSON objects concatenated on the same line
-    (e.g. "{}{}") and JSON objects split across multiple lines by buffering and
-    using JSONDecoder.raw_decode.
+    Each well-formed line is parsed directly (with orjson when available).
+    Lines that don't parse on their own fall back to a buffered
+    JSONDecoder.raw_decode, which tolerates multiple JSON objects concatenated
+    on the same line (e.g. "{}{}") and JSON objects split across multiple lines.
     """
     decoder = json.JSONDecoder()
-    with open(path, 'r', encoding='utf-8') as f:
+    with open(path, 'rb') as f:
         buffer = ''
         for line in f:
-            if not line.strip():
+            # lines from a file are never empty, so isspace() matches blank
+            # lines without the copy that strip() makes
+            if line.isspace():
                 continue
-            buffer += line
+            if not buffer:
+                try:
+                    yield _loads(line)
+                    continue
+                except ValueError:
+                    pass
+            buffer += line.decode('utf-8')
             buffer = buffer.lstrip()
             while buffer:
                 try:
@@ -42,35 +67,40 @@ def save_json(path: str, obj):
         json.dump(obj, f, ensure_ascii=False, indent=2)
 
 
-def split_response_to_numbers_and_text(s: str):
+def split_response_to_numbers_and_text(s: str) -> Tuple[List[float], str]:
     """Return (numbers_list, cleaned_text) where numbers_list are numeric substrings suitable for Benford
     and cleaned_text is the input with numbers/dates/serials removed for Zipf analysis.
     """
-    import re
-    import re
     if not s:
         return [], ''
-    # regex for numbers (with optional leading sign and currency), scientific
-    # capture group 'num' contains the numeric token possibly with sign/currency
-    num_re = re.compile(r"(?<!\w)(?P<num>[-+]?\s*[$€£¥]?\s*(?:\d{1,3}(?:,\d{3})*|\d+)(?:\.\d+)?(?:[eE][+-]?\d+)?)")
-    time_re = re.compile(r"\b\d{2}:\d{2}:\d{2}(?:\.\d+)?\b")
-    # extract numbers
-    numbers = num_re.findall(s)
-    # iterate with spans so we can detect surrounding parentheses for negative values
+    numbers, cleaned = _split_cached(s)
+    # callers own the returned list, so hand out a copy of the cached tuple
+    return list(numbers), cleaned
+
+
+@lru_cache(maxsize=1024)
+def _split_cached(s: str) -> Tuple[tuple, str]:
+    # identical responses recur across --n-per-prompt replays and fixtures
+    # a single pass collects the numbers and the text between them; times and
+    # serials like ABC-12345-678 lose their digits to NUM_RE as well, so they
+    # need no separate passes
     numbers = []
-    for m in num_re.finditer(s):
+    parts = []
+    pos = 0
+    n = len(s)
+    for m in NUM_RE.finditer(s):
         raw = m.group('num')
         start, end = m.span('num')
+        parts.append(s[pos:start])
+        pos = end
         # normalize: remove spaces and thousands separators
         norm = raw.replace(' ', '').replace(',', '')
         # strip common currency symbols from start
-        norm = re.sub(r'^[\$€£¥]+', '', norm)
+        norm = CURRENCY_PREFIX_RE.sub('', norm)
         # strip trailing percent
         norm = norm.rstrip('%')
         # detect parentheses around the numeric token in the original string
-        has_paren_negative = False
-        if start > 0 and end < len(s) and s[start - 1] == '(' and s[end] == ')':
-            has_paren_negative = True
+        has_paren_negative = start > 0 and end < n and s[start - 1] == '(' and s[end] == ')'
         try:
             val = float(norm)
             if has_paren_negative:
@@ -79,19 +109,15 @@ def split_response_to_numbers_and_text(s: str):
         except Exception:
             # fallback: try to remove non numeric chars and parse
             try:
-                fallback = re.sub(r'[^0-9eE+\-\.]', '', norm)
+                fallback = NON_NUMERIC_RE.sub('', norm)
                 val = float(fallback)
                 if has_paren_negative:
                     val = -val
                 numbers.append(val)
             except Exception:
                 continue
+    parts.append(s[pos:])
 
-    # remove numbers and dates/times from text
-    cleaned = num_re.sub(' ', s)
-    cleaned = time_re.sub(' ', cleaned)
-    # remove typical serial patterns like ABC-12345-678
-    cleaned = re.sub(r"[A-Z]{2,}-\d[-A-Z0-9]+", ' ', cleaned)
-    # normalize whitespace
-    cleaned = re.sub(r"\s+", ' ', cleaned).strip()
-    return numbers, cleaned
+    # numbers are replaced by spaces, then whitespace is normalized
+    cleaned = ' '.join(' '.join(parts).split())
+    return tuple(numbers), cleaned
@@ -2,24 +2,22 @@ import os
 from collections import Counter
 from typing import List
 import numpy as np
-import matplotlib.pyplot as plt
-from .analyzer_benford import extract_numbers_from_text, first_digits, benford_expected
-from .analyzer_zipf import tokenize
+from .analyzer_benford import extract_numbers_from_texts, first_digits, benford_expected
+from .analyzer_zipf import tokenize, loglog_fit, rank_frequencies
 from .utils import read_jsonl
 from .analyzer_benford import benford_chi_squared
-from collections import defaultdict
+from collections import defaultdict, OrderedDict
 
 
 def plot_benford_from_texts(texts: List[str], out_path: str):
-    nums = []
-    for t in texts:
-        nums.extend(extract_numbers_from_text(t))
-    fd = first_digits(nums)
-    counts = np.array([Counter(fd).get(d, 0) for d in range(1, 10)])
+    from matplotlib.figure import Figure
+    fd = first_digits(extract_numbers_from_texts(texts))
+    counts = np.bincount(fd, minlength=10)[1:10]
     total = counts.sum()
     expected = benford_expected() * total
 
-    fig, ax = plt.subplots()
+    fig = Figure()
+    ax = fig.subplots()
     digits = list(range(1, 10))
     ax.bar(digits, counts, alpha=0.6, label='observed')
     ax.plot(digits, expected, marker='o', color='red', label='expected')
@@ -30,30 +28,25 @@ def plot_benford_from_texts(texts: List[str], out_path: str):
     ax.legend()
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
     fig.savefig(out_path)
-    plt.close(fig)
 
 
 def plot_zipf_from_texts(texts: List[str], out_path: str):
-    tokens = []
-    for t in texts:
-        tokens.extend(tokenize(t))
-    counts = Counter(tokens)
-    freqs = sorted(counts.values(), reverse=True)
-    ranks = np.arange(1, len(freqs) + 1)
+    from matplotlib.figure import Figure
+    freqs = rank_frequencies(_token_counts(texts))
+    log_r = np.log(np.arange(1, len(freqs) + 1))
 
-    fig, ax = plt.subplots()
-    ax.scatter(np.log(ranks), np.log(freqs), s=8)
+    fig = Figure()
+    ax = fig.subplots()
+    ax.scatter(log_r, np.log(freqs), s=8)
     # fit linear regression in log-log
-    if len(ranks) >= 2:
-        slope, intercept = np.polyfit(np.log(ranks), np.log(freqs), 1)
-        fit = np.exp(intercept) * (ranks ** slope)
-        ax.plot(np.log(ranks), np.log(fit), color='red')
+    if len(freqs) >= 2:
+        slope, intercept, _ = loglog_fit(freqs)
+        ax.plot(log_r, slope * log_r + intercept, color='red')
     ax.set_xlabel('log(rank)')
     ax.set_ylabel('log(freq)')
     ax.set_title('Zipf Distribution')
     os.makedirs(os.path.dirname(out_path), exist_ok=True)
     fig.savefig(out_path)
-    plt.close(fig)
 
 
 def load_responses_from_jsonl(path: str) -> List[str]:
@@ -82,109 +75,168 @@ def group_by_model(path: str):
 
 
 def benford_stats_for_texts(texts: List[str]):
-    nums = []
-    for t in texts:
-        nums.extend(extract_numbers_from_text(t))
-    fd = first_digits(nums)
-    if not fd:
+    fd = first_digits(extract_numbers_from_texts(texts))
+    if len(fd) == 0:
         return None
     chi2, p, counts, expected = benford_chi_squared(fd)
     return {'chi2': float(chi2), 'p': float(p), 'counts': counts.tolist(), 'expected': expected.tolist()}
 
 
-def zipf_stats_for_texts(texts: List[str]):
-    tokens = []
+def _token_counts(texts: List[str]) -> Counter:
+    # count while tokenizing so peak memory follows the vocabulary, not the
+    # total number of tokens
+    counts = Counter()
     for t in texts:
-        tokens.extend(tokenize(t))
-    counts = Counter(tokens)
-    freqs = np.array(sorted(counts.values(), reverse=True))
+        counts.update(tokenize(t))
+    return counts
+
+
+def _zipf_stats_from_counts(counts: Counter):
+    # returns the stats dict (or None) together with the rank-ordered
+    # frequencies, so plotting can reuse them instead of re-tokenizing
+    freqs = rank_frequencies(counts)
     if len(freqs) < 2:
-        return None
-    ranks = np.arange(1, len(freqs) + 1).reshape(-1, 1)
-    log_r = np.log(ranks).flatten()
-    log_f = np.log(freqs)
-    # fit linear model on log-log via numpy.polyfit
-    slope, intercept = np.polyfit(log_r, log_f, 1)
-    pred = slope * log_r + intercept
-    # compute R^2 manually
-    ss_res = np.sum((log_f - pred) ** 2)
-    ss_tot = np.sum((log_f - np.mean(log_f)) ** 2)
-    r2 = float(1 - ss_res / ss_tot) if ss_tot > 0 else 0.0
-    return {'slope': slope, 'r2': r2, 'n_types': int(len(freqs))}
-
-
-def plot_per_model(path: str, out_dir: str = 'outputs'):
+        return None, freqs
+    # closed-form least squares on log-log; no Vandermonde/SVD as in polyfit
+    slope, intercept, r2 = loglog_fit(freqs)
+    return {'slope': slope, 'intercept': intercept, 'r2': r2, 'n_types': int(len(freqs))}, freqs
+
+
+def zipf_stats_for_texts(texts: List[str]):
+    return _zipf_stats_from_counts(_token_counts(texts))[0]
+
+
+def _analyze_model(texts: List[str]):
+    # module-level so that it can be pickled for ProcessPoolExecutor workers
+    # tokenize once; the frequencies feed both the stats and the plots
+    stats_z, freqs = _zipf_stats_from_counts(_token_counts(texts))
+    return {'n_texts': len(texts), 'benford': benford_stats_for_texts(texts), 'zipf': stats_z, 'freqs': freqs}
+
+
+_ANALYSIS_CACHE = OrderedDict()
+_ANALYSIS_CACHE_SIZE = 8
+
+
+def analyze(path: str, workers: int = 1):
+    """Return ``{model: {'n_texts', 'benford', 'zipf', 'freqs'}}`` for a JSONL file.
+
+    Results are cached per file (keyed on its path, size and mtime), so
+    ``export_stats_csv`` and ``plot_per_model`` on the same input extract
+    numbers and tokens only once. Treat the returned dict as read-only.
+    """
+    st = os.stat(path)
+    key = (os.path.abspath(path), st.st_size, st.st_mtime_ns)
+    cached = _ANALYSIS_CACHE.get(key)
+    if cached is not None:
+        _ANALYSIS_CACHE.move_to_end(key)
+        return cached
     models = group_by_model(path)
+    if workers > 1 and len(models) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(models))) as ex:
+            results = list(ex.map(_analyze_model, models.values()))
+    else:
+        results = [_analyze_model(texts) for texts in models.values()]
+    analysis = dict(zip(models, results))
+    _ANALYSIS_CACHE[key] = analysis
+    if len(_ANALYSIS_CACHE) > _ANALYSIS_CACHE_SIZE:
+        _ANALYSIS_CACHE.popitem(last=False)
+    return analysis
+
+
+def _render_model(item):
+    # module-level so that it can be pickled for ProcessPoolExecutor workers
+    from matplotlib.figure import Figure
+    model_name, stats_b, stats_z, freqs, out_dir = item
+    # benford plot
+    if stats_b:
+        fig = Figure()
+        ax = fig.subplots()
+        digits = list(range(1, 10))
+        counts = np.array(stats_b['counts'])
+        expected = np.array(stats_b['expected'])
+        ax.bar(digits, counts, alpha=0.6)
+        ax.plot(digits, expected, marker='o', color='red')
+        ax.set_title(
+            f"Benford - {model_name} (p={stats_b['p']:.3g})"
+        )
+        fig.savefig(os.path.join(out_dir, f'benford_{model_name}.png'))
+    # zipf plot
+    log_r = log_f = None
+    if stats_z:
+        fig = Figure()
+        ax = fig.subplots()
+        log_r = np.log(np.arange(1, len(freqs) + 1))
+        log_f = np.log(freqs)
+        ax.scatter(log_r, log_f, s=8)
+        slope = stats_z['slope']
+        # fit line from the stats' own least-squares coefficients; in log-log
+        # space log(e^b * r^a) is just a*log(r) + b
+        ax.plot(log_r, slope * log_r + stats_z['intercept'], color='red')
+        ax.set_title(
+            f"Zipf - {model_name} (slope={slope:.3g}, R2={stats_z['r2']:.3g})"
+        )
+        fig.savefig(os.path.join(out_dir, f'zipf_{model_name}.png'))
+    return log_r, log_f
+
+
+def plot_per_model(path: str, out_dir: str = 'outputs', workers: int = 1):
+    """Write Benford and Zipf plots for every model plus a Zipf overlay.
+
+    Models are independent, so with ``workers > 1`` they are rendered in a
+    process pool; the overlay is drawn afterwards from the returned arrays.
+    """
+    from matplotlib.figure import Figure
+    models = analyze(path, workers=workers)
     os.makedirs(out_dir, exist_ok=True)
     combined = []
-    zipf_overlay = plt.figure()
+    items = [(model_name, a['benford'], a['zipf'], a['freqs'], out_dir) for model_name, a in models.items()]
+    if workers > 1 and len(items) > 1:
+        from concurrent.futures import ProcessPoolExecutor
+        with ProcessPoolExecutor(max_workers=min(workers, len(items))) as ex:
+            results = list(ex.map(_render_model, items))
+    else:
+        results = [_render_model(item) for item in items]
+    zipf_overlay = Figure()
     ax_overlay = zipf_overlay.add_subplot(1,1,1)
-    for model_name, texts in models.items():
-        stats_b = benford_stats_for_texts(texts)
-        stats_z = zipf_stats_for_texts(texts)
-        # benford plot
-        if stats_b:
-            fig, ax = plt.subplots()
-            digits = list(range(1, 10))
-            counts = np.array(stats_b['counts'])
-            expected = np.array(stats_b['expected'])
-            ax.bar(digits, counts, alpha=0.6)
-            ax.plot(digits, expected, marker='o', color='red')
-            ax.set_title(
-                f"Benford - {model_name} (p={stats_b['p']:.3g})"
-            )
-            fig.savefig(os.path.join(out_dir, f'benford_{model_name}.png'))
-            plt.close(fig)
-        # zipf plot
-        if stats_z:
-            fig, ax = plt.subplots()
-            tokens = []
-            for t in texts:
-                tokens.extend(tokenize(t))
-            freqs = sorted(Counter(tokens).values(), reverse=True)
-            ranks = np.arange(1, len(freqs) + 1)
-            ax.scatter(np.log(ranks), np.log(freqs), s=8)
-            slope = stats_z['slope']
-            # fit line for plotting
-            coeffs = np.polyfit(np.log(ranks), np.log(freqs), 1)
-            fit = np.exp(coeffs[1]) * (ranks ** coeffs[0])
-            ax.plot(np.log(ranks), np.log(fit), color='red')
-            ax.set_title(
-                f"Zipf - {model_name} (slope={slope:.3g}, R2={stats_z['r2']:.3g})"
-            )
-            fig.savefig(os.path.join(out_dir, f'zipf_{model_name}.png'))
-            plt.close(fig)
-            # overlay
-            ax_overlay.scatter(np.log(ranks), np.log(freqs), s=6, label=model_name)
+    for model_name, (log_r, log_f) in zip(models, results):
+        if log_r is not None:
+            ax_overlay.scatter(log_r, log_f, s=6, label=model_name)
     ax_overlay.set_title('Zipf overlay')
     ax_overlay.legend()
     zipf_overlay.savefig(os.path.join(out_dir, 'zipf_overlay.png'))
-    plt.close(zipf_overlay)
     # return computed stats for possible further use
     return combined
 
 
-def export_stats_csv(path: str, out_csv: str = 'outputs/stats_summary.csv'):
-    """Compute per-model Benford and Zipf statistics and export to CSV."""
+STATS_FIELDS = ['model', 'n_texts', 'benford_chi2', 'benford_p', 'zipf_slope', 'zipf_r2', 'zipf_types']
+
+
+def _model_stats_row(model_name, a):
+    stats_b = a['benford'] or {}
+    stats_z = a['zipf'] or {}
+    return {
+        'model': model_name,
+        'n_texts': a['n_texts'],
+        'benford_chi2': stats_b.get('chi2'),
+        'benford_p': stats_b.get('p'),
+        'zipf_slope': stats_z.get('slope'),
+        'zipf_r2': stats_z.get('r2'),
+        'zipf_types': stats_z.get('n_types'),
+    }
+
+
+def export_stats_csv(path: str, out_csv: str = 'outputs/stats_summary.csv', workers: int = 1):
+    """Compute per-model Benford and Zipf statistics and export to CSV.
+
+    Models are independent, so with ``workers > 1`` their statistics are
+    computed in a process pool. Row order follows the input file either way.
+    """
     import csv
-    models = group_by_model(path)
-    rows = []
-    for model_name, texts in models.items():
-        stats_b = benford_stats_for_texts(texts) or {}
-        stats_z = zipf_stats_for_texts(texts) or {}
-        rows.append({
-            'model': model_name,
-            'n_texts': len(texts),
-            'benford_chi2': stats_b.get('chi2'),
-            'benford_p': stats_b.get('p'),
-            'zipf_slope': stats_z.get('slope'),
-            'zipf_r2': stats_z.get('r2'),
-            'zipf_types': stats_z.get('n_types'),
-        })
+    rows = [_model_stats_row(model_name, a) for model_name, a in analyze(path, workers=workers).items()]
     os.makedirs(os.path.dirname(out_csv), exist_ok=True)
     with open(out_csv, 'w', newline='', encoding='utf-8') as f:
-        writer = csv.DictWriter(f, fieldnames=['model','n_texts','benford_chi2','benford_p','zipf_slope','zipf_r2','zipf_types'])
-        writer.writeheader()
-        for r in rows:
-            writer.writerow(r)
+        writer = csv.writer(f)
+        writer.writerow(STATS_FIELDS)
+        writer.writerows([r.get(k) for k in STATS_FIELDS] for r in rows)
     return out_csv
@@ -22,7 +22,7 @@ import os
 import sys
 import datetime
 from pathlib import Path
-from typing import List, Set
+from typing import List, Set, Tuple
 
 # === EDIT THIS WHITELIST to control what is kept (paths relative to repo root) ===
 WHITELIST = {
@@ -67,33 +67,40 @@ IGNORE_EXT = {".bak", ".zip"}  # you can extend if needed
 ROOT = Path(".").resolve()
 
 
-def is_whitelisted(path: Path, whitelist: Set[str]) -> bool:
-    rel = path.relative_to(ROOT)
-    # Check direct path or prefix directory in whitelist
-    for w in whitelist:
-        wpath = Path(w)
-        try:
-            # if the whitelist item is a directory, allow files under it
-            if wpath == rel or wpath in rel.parents:
-                return True
-        except Exception:
-            pass
-    return False
+def whitelist_prefixes(whitelist: Set[str]) -> Tuple[Set[Tuple[str, ...]], List[int]]:
+    """Return the whitelist as a set of path-part tuples and their distinct lengths."""
+    tuples = {tuple(Path(w).parts) for w in whitelist}
+    return tuples, sorted({len(t) for t in tuples})
+
+
+WL_TUPLES, WL_DEPTHS = whitelist_prefixes(WHITELIST)
+
+
+def is_whitelisted(rel_parts: Tuple[str, ...], wl_tuples=WL_TUPLES, wl_depths=WL_DEPTHS) -> bool:
+    # a whitelisted path matches itself; a whitelisted directory matches every
+    # file under it, i.e. any prefix of rel_parts of a whitelisted length
+    n = len(rel_parts)
+    return any(rel_parts[:d] in wl_tuples for d in wl_depths if d <= n)
 
 
 def collect_candidates(root: Path, whitelist: Set[str]) -> List[Path]:
+    def walk(d):
+        # scandir entries know whether they are directories without a stat call,
+        # and ignored directories are pruned instead of being descended into
+        with os.scandir(d) as it:
+            for entry in it:
+                if entry.is_dir(follow_symlinks=False):
+                    if entry.name not in IGNORE_DIRS:
+                        yield from walk(entry.path)
+                elif not entry.is_dir():
+                    yield Path(entry.path)
+
+    wl_tuples, wl_depths = whitelist_prefixes(whitelist)
     candidates = []
-    for p in root.rglob("*"):
-        if p == root:
-            continue
-        # skip ignored directories anywhere in the path
-        if any(part in IGNORE_DIRS for part in p.parts):
-            continue
-        if p.is_dir():
-            continue
+    for p in walk(root):
         if p.suffix in IGNORE_EXT:
             continue
-        if is_whitelisted(p, whitelist):
+        if is_whitelisted(p.relative_to(root).parts, wl_tuples, wl_depths):
             continue
         candidates.append(p)
     return sorted(candidates)
@@ -115,7 +122,13 @@ def archive_files(cands: List[Path], dst_root: Path) -> None:
         rel = p.relative_to(ROOT)
         dst = dst_root / rel
         dst.parent.mkdir(parents=True, exist_ok=True)
-        shutil.move(str(p), str(dst))
+        try:
+            # archive/ lives under the repo root, so this is nearly always a
+            # same-filesystem rename
+            os.replace(str(p), str(dst))
+        except OSError:
+            # e.g. archive/ is a mount on another device
+            shutil.move(str(p), str(dst))
     print(f"Moved {len(cands)} files to {dst_root}")
 
 
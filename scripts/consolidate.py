@@ -2,7 +2,7 @@
 and compute a lightweight per-topic Benford summary CSV.
 
 Usage:
-  PYTHONPATH=. python scripts/consolidate.py
+  PYTHONPATH=. python scripts/consolidate.py [--workers N]
 
 Produces:
   - sample_data/combined_outputs.jsonl
@@ -13,11 +13,16 @@ This script is conservative: it backs up existing combined file if present, and
 avoids touching backups (files with .bak in name).
 """
 from __future__ import annotations
+import hashlib
 import json
 import os
 import re
+import sys
 from pathlib import Path
 from collections import defaultdict, Counter
+from concurrent.futures import ProcessPoolExecutor
+from contextlib import ExitStack
+from itertools import repeat
 import math
 
 ROOT = Path(__file__).resolve().parents[1]
@@ -28,6 +33,10 @@ OUTPUT_COMBINED = SAMPLE_DIR / "combined_outputs.jsonl"
 CONSOLIDATED_PROMPTS = ROOT / "prompts" / "consolidated_prompts_by_topic.txt"
 OUTPUT_CSV = ROOT / "outputs" / "topic_comparison.csv"
 
+# make llm_verification importable without PYTHONPATH=.
+sys.path.append(str(ROOT))
+from llm_verification.analyzer_benford import first_digits
+
 BENFORD_EXPECTED = {d: math.log10(1 + 1.0 / d) for d in range(1, 10)}
 
 
@@ -50,28 +59,100 @@ def load_meta_rules(meta_path: Path):
                 compiled = re.compile(pattern, flags=f)
             except re.error:
                 compiled = None
-        rules.append({"pattern": pattern, "type": typ, "regex": regex, "compiled": compiled})
+        # substring rules (and regexes that failed to compile) compare
+        # case-insensitively; lowercase their pattern once here
+        pattern_lower = pattern.lower() if compiled is None and pattern is not None else None
+        rules.append({"pattern": pattern, "pattern_lower": pattern_lower, "type": typ, "regex": regex, "compiled": compiled})
     return rules
 
 
-def detect_topic(prompt_text: str, rules):
+# numbered backreferences would point at the wrong group once the rules are
+# wrapped in named groups of a combined pattern
+_NUMBERED_BACKREF_RE = re.compile(r"\\(?:[1-9]|g<\d+>)")
+
+
+def combine_regex_rules(rules):
+    """Join the regex rules into one ``(?P<t{i}>...)|...`` alternation.
+
+    A single ``search()`` then tells ``detect_topic`` whether any regex rule
+    matches and which one matched first in the text. The alternation is
+    compiled with the ``regex`` package, which scans it about twice as fast
+    as one stdlib search per rule (stdlib ``re`` is slower on the combined
+    pattern than on the separate ones). Returns None when ``regex`` is
+    missing, there is nothing to combine or the patterns can't be combined
+    safely; ``detect_topic`` then checks the rules one by one.
+    """
+    try:
+        import regex
+    except ImportError:
+        return None
+    parts = []
+    for i, r in enumerate(rules):
+        if not (r["regex"] and r["compiled"] is not None):
+            continue
+        if _NUMBERED_BACKREF_RE.search(r["pattern"]):
+            return None
+        flags = "i" if r["compiled"].flags & re.IGNORECASE else ""
+        parts.append(f"(?P<t{i}>(?{flags}:{r['pattern']}))")
+    if not parts:
+        return None
+    try:
+        return regex.compile("|".join(parts))
+    except regex.error:
+        # e.g. a pattern with global inline flags or a group name clash
+        return None
+
+
+def detect_topic(prompt_text: str, rules, combined=None):
     if not prompt_text:
         return "unknown"
-    for r in rules:
+    hit = None
+    if combined is not None:
+        m = combined.search(prompt_text)
+        if m is not None:
+            # the outermost group of the winning alternative closes last
+            hit = int(m.lastgroup[1:])
+    lp = None
+    # rules are tried in order; with a combined match only the rules listed
+    # before the one that matched can still take priority over it
+    for r in rules if hit is None else rules[:hit]:
         if r["regex"] and r["compiled"] is not None:
+            if combined is not None and hit is None:
+                # no regex rule matched anywhere in the text
+                continue
             if r["compiled"].search(prompt_text):
                 return r["type"]
         else:
             # non-regex: use case-insensitive substring match
-            if r["pattern"].lower() in prompt_text.lower():
+            if lp is None:
+                lp = prompt_text.lower()
+            if r["pattern_lower"] in lp:
                 return r["type"]
-    return "other"
+    return rules[hit]["type"] if hit is not None else "other"
+
+
+def _walk_files(d, suffix: str):
+    """Yield paths of files under ``d`` whose name ends with ``suffix``.
+
+    ``os.scandir`` entries carry their type from ``readdir``, so unlike
+    ``Path.rglob`` this does not ``stat`` every entry.
+    """
+    try:
+        it = os.scandir(d)
+    except OSError:
+        return
+    with it:
+        for entry in it:
+            if entry.is_dir(follow_symlinks=False):
+                yield from _walk_files(entry.path, suffix)
+            elif entry.name.endswith(suffix) and entry.is_file():
+                yield Path(entry.path)
 
 
 def list_jsonl_files(sample_dir: Path):
     files = []
     # search recursively to include files in subdirectories (e.g., by_topic)
-    for p in sample_dir.rglob("*.jsonl"):
+    for p in _walk_files(sample_dir, ".jsonl"):
         if ".bak" in p.name or p.name == OUTPUT_COMBINED.name:
             continue
         # skip files inside tests/fixtures if any
@@ -85,50 +166,18 @@ NUM_RE = re.compile(r"[+-]?\$?\(?\d[\d,\.eE]*")
 def extract_numbers(text: str):
     if not text:
         return []
-    matches = NUM_RE.findall(text)
     nums = []
-    for m in matches:
-        s = m
-        # strip currency symbols and parentheses
-        s = s.replace("$", "")
-        s = s.replace("(", "-") if s.startswith("(") and s.endswith(")") else s
-        s = s.replace(")", "")
-        s = s.replace(",", "")
+    for m in NUM_RE.findall(text):
+        # strip currency symbols, closing parentheses and thousands separators.
+        # NUM_RE never ends on ')', so a leading '(' stays and the token fails
+        # to parse, as it always has
         try:
-            val = float(s)
-            nums.append(val)
-        except Exception:
-            # try to parse scientific or ignore
-            try:
-                nums.append(float(s))
-            except Exception:
-                continue
+            nums.append(float(m.replace("$", "").replace(")", "").replace(",", "")))
+        except ValueError:
+            continue
     return nums
 
 
-def leading_digit(n: float):
-    n = abs(n)
-    if n == 0 or math.isnan(n) or math.isinf(n):
-        return None
-    # normalize to remove decimals and exponents
-    # convert to string w/o scientific notation
-    s = f"{n:.15g}"
-    s = s.lstrip('0').lstrip('.')
-    for ch in s:
-        if ch.isdigit() and ch != '0':
-            return int(ch)
-    # fallback
-    try:
-        while n >= 10:
-            n /= 10.0
-        while n < 1 and n > 0:
-            n *= 10.0
-        d = int(n)
-        return d if d >= 1 else None
-    except Exception:
-        return None
-
-
 def compute_benford_stats(digits_counter: Counter):
     total = sum(digits_counter.get(d, 0) for d in range(1, 10))
     if total == 0:
@@ -150,8 +199,65 @@ def compute_benford_stats(digits_counter: Counter):
     return {"n": total, "chi2": chi2, "p": p, "obs": {d: digits_counter.get(d, 0) for d in range(1, 10)}}
 
 
-def main():
+def _ingest_file(jf: Path, rules, combined=None):
+    """Parse one JSONL file into (key, line, pair, digits, tokens) per record.
+
+    Module-level so that files can be handed to ProcessPoolExecutor workers;
+    deduplication across files is left to the caller, which sees the records
+    in file order.
+    """
+    try:
+        from llm_verification.analyzer_zipf import tokenize
+    except Exception:
+        # if dependencies are missing, the zipf fields are left empty
+        tokenize = None
+    out = []
+    # prompts repeat across n-per-prompt runs and models; classify each once
+    topic_by_prompt = {}
+    with jf.open("r", encoding="utf-8") as fh:
+        for line in fh:
+            line = line.strip()
+            if not line:
+                continue
+            try:
+                rec = json.loads(line)
+            except Exception:
+                continue
+            # canonical form so key order/whitespace don't matter; only the
+            # 16-byte digest is kept in memory
+            key = hashlib.blake2b(
+                json.dumps(rec, sort_keys=True, separators=(",", ":")).encode("utf-8"), digest_size=16
+            ).digest()
+            # Priority for topic detection:
+            # 1) use existing rec['_topic'] if the record was pre-labeled
+            # 2) else use prompts_meta rules (if any)
+            # 3) else fall back to the JSONL filename stem (useful when files are organized by topic)
+            if rec.get('_topic'):
+                topic = rec.get('_topic')
+            else:
+                prompt_text = rec.get("prompt") or rec.get("instruction") or ""
+                if rules:
+                    topic = topic_by_prompt.get(prompt_text)
+                    if topic is None:
+                        topic = topic_by_prompt[prompt_text] = detect_topic(prompt_text, rules, combined)
+                else:
+                    # no rules: default to using the filename stem as topic
+                    try:
+                        topic = jf.stem
+                    except Exception:
+                        topic = detect_topic(prompt_text, rules, combined)
+            rec["_topic"] = topic
+            # extract numbers from response; first_digits drops zeros/inf/NaN
+            resp = rec.get("response") or rec.get("output") or ""
+            digits = first_digits(extract_numbers(resp)).tolist()
+            tokens = tokenize(resp) if tokenize is not None else None
+            out.append((key, json.dumps(rec, ensure_ascii=False), (topic, rec.get("model", "unknown")), digits, tokens))
+    return out
+
+
+def main(workers: int = 1):
     rules = load_meta_rules(PROMPTS_META)
+    combined = combine_regex_rules(rules)
     jsonl_files = list_jsonl_files(SAMPLE_DIR)
     print("Found JSONL files:", jsonl_files)
 
@@ -161,47 +267,35 @@ def main():
         print("Backing up existing combined to", bak)
         OUTPUT_COMBINED.replace(bak)
 
+    # records are written and aggregated file by file, so neither the records
+    # nor their response texts are kept around
+    combo = defaultdict(Counter)  # (topic, model) -> leading digit counts
+    texts_count = defaultdict(int)
+    tokens_by_pair = defaultdict(Counter)  # (topic, model) -> word counts for Zipf
+    n_written = 0
     seen = set()
-    combined_records = []
-    for jf in jsonl_files:
-        with jf.open("r", encoding="utf-8") as fh:
-            for line in fh:
-                line = line.strip()
-                if not line:
-                    continue
-                try:
-                    rec = json.loads(line)
-                except Exception:
-                    continue
-                key = json.dumps(rec, sort_keys=True)
+    OUTPUT_COMBINED.parent.mkdir(parents=True, exist_ok=True)
+    with OUTPUT_COMBINED.open("w", encoding="utf-8") as outfh, ExitStack() as stack:
+        if workers > 1 and len(jsonl_files) > 1:
+            # files are parsed in parallel; map() still yields them in order
+            ex = stack.enter_context(ProcessPoolExecutor(max_workers=min(workers, len(jsonl_files))))
+            parsed = ex.map(_ingest_file, jsonl_files, repeat(rules), repeat(combined))
+        else:
+            parsed = map(_ingest_file, jsonl_files, repeat(rules), repeat(combined))
+        for records in parsed:
+            for key, line, pair, digits, tokens in records:
                 if key in seen:
                     continue
                 seen.add(key)
-                # Priority for topic detection:
-                # 1) use existing rec['_topic'] if the record was pre-labeled
-                # 2) else use prompts_meta rules (if any)
-                # 3) else fall back to the JSONL filename stem (useful when files are organized by topic)
-                if rec.get('_topic'):
-                    topic = rec.get('_topic')
-                else:
-                    prompt_text = rec.get("prompt") or rec.get("instruction") or ""
-                    if rules:
-                        topic = detect_topic(prompt_text, rules)
-                    else:
-                        # no rules: default to using the filename stem as topic
-                        try:
-                            topic = jf.stem
-                        except Exception:
-                            topic = detect_topic(prompt_text, rules)
-                rec["_topic"] = topic
-                combined_records.append(rec)
-
-    # write combined
-    OUTPUT_COMBINED.parent.mkdir(parents=True, exist_ok=True)
-    with OUTPUT_COMBINED.open("w", encoding="utf-8") as outfh:
-        for rec in combined_records:
-            outfh.write(json.dumps(rec, ensure_ascii=False) + "\n")
-    print(f"Wrote {len(combined_records)} records to {OUTPUT_COMBINED}")
+                outfh.write(line + "\n")
+                n_written += 1
+                texts_count[pair] += 1
+                if tokens is not None:
+                    tokens_by_pair[pair].update(tokens)
+                if digits:
+                    # pairs without any numbers stay out of the CSV
+                    combo[pair].update(digits)
+    print(f"Wrote {n_written} records to {OUTPUT_COMBINED}")
 
     # consolidate prompts files from the prompts/ directory and archive/
     prompts_by_topic = defaultdict(list)
@@ -209,7 +303,7 @@ def main():
     prompt_paths = []
     prompt_paths.extend(sorted((ROOT / "prompts").glob("*.txt")))
     # include .txt files under archive/ recursively (some old prompts live there)
-    prompt_paths.extend(sorted((ROOT / "archive").rglob("*.txt")))
+    prompt_paths.extend(sorted(_walk_files(ROOT / "archive", ".txt")))
     # de-duplicate while preserving order
     seen_prompt_paths = []
     seen_names = set()
@@ -239,12 +333,12 @@ def main():
         for ln in lines:
                 # If we have meta rules, use them to detect topic; otherwise use the source filename stem
                 if rules:
-                    t = detect_topic(ln, rules)
+                    t = detect_topic(ln, rules, combined)
                 else:
                     try:
                         t = p.stem
                     except Exception:
-                        t = detect_topic(ln, rules)
+                        t = detect_topic(ln, rules, combined)
                 prompts_by_topic[t].append((p.name, ln))
 
     # ensure prompts dir
@@ -256,26 +350,6 @@ def main():
                 pf.write(f"# source: {src}\n{ln}\n\n")
     print(f"Wrote consolidated prompts to {CONSOLIDATED_PROMPTS}")
 
-    # compute per-topic per-model benford summary
-    stats = []
-    # structure: stats[(topic, model)] -> digits counter & counts
-    combo = defaultdict(Counter)
-    texts_count = defaultdict(int)
-    texts_by_pair = defaultdict(list)
-    for rec in combined_records:
-        topic = rec.get("_topic", "other")
-        model = rec.get("model", "unknown")
-        texts_count[(topic, model)] += 1
-        # extract numbers from response
-        resp = rec.get("response") or rec.get("output") or ""
-        # store responses for later Zipf analysis
-        texts_by_pair[(topic, model)].append(resp)
-        nums = extract_numbers(resp)
-        for n in nums:
-            d = leading_digit(n)
-            if d is not None and 1 <= d <= 9:
-                combo[(topic, model)][d] += 1
-
     # prepare CSV
     OUTPUT_CSV.parent.mkdir(parents=True, exist_ok=True)
     with OUTPUT_CSV.open("w", encoding="utf-8") as csvf:
@@ -294,13 +368,13 @@ def main():
             zipf_r2 = ""
             zipf_types = ""
             try:
-                from llm_verification.visualize import zipf_stats_for_texts
-                texts = texts_by_pair.get((topic, model), [])
-                stats_z = zipf_stats_for_texts(texts)
-                if stats_z:
-                    zipf_slope = str(stats_z.get('slope'))
-                    zipf_r2 = str(stats_z.get('r2'))
-                    zipf_types = str(stats_z.get('n_types'))
+                from llm_verification.analyzer_zipf import loglog_fit, rank_frequencies
+                freqs = rank_frequencies(tokens_by_pair.get((topic, model), Counter()))
+                if len(freqs) >= 2:
+                    slope, _, r2 = loglog_fit(freqs)
+                    zipf_slope = str(slope)
+                    zipf_r2 = str(r2)
+                    zipf_types = str(len(freqs))
             except Exception:
                 # if dependencies missing or any error, leave zipf fields empty
                 pass
@@ -311,4 +385,7 @@ def main():
 
 
 if __name__ == "__main__":
-    main()
+    import argparse
+    parser = argparse.ArgumentParser(description="Consolidate JSONL outputs and prompts into per-topic summaries.")
+    parser.add_argument("--workers", type=int, default=1, help="Parse JSONL files in this many processes")
+    main(workers=parser.parse_args().workers)
@@ -6,78 +6,67 @@ Reads: outputs/topic_comparison.csv
 Writes: outputs/summary/chi2_heatmap.png, outputs/summary/benford_by_topic_combined.png
 """
 from __future__ import annotations
-import csv
-from collections import defaultdict
-from math import log10
 from pathlib import Path
 import os
+import numpy as np
+import numpy.ma as ma
+import pandas as pd
+import matplotlib
+# headless file output only; select Agg before pyplot is imported
+matplotlib.use('Agg')
+import matplotlib.pyplot as plt
+from matplotlib.colors import LogNorm, Normalize
 ROOT = Path(__file__).resolve().parents[1]
 IN = ROOT / 'outputs' / 'topic_comparison.csv'
 OUT_DIR = ROOT / 'outputs' / 'summary'
 OUT_DIR.mkdir(parents=True, exist_ok=True)
+# zlib level 1 instead of Pillow's default 6: lossless, encodes noticeably
+# faster when the plots are regenerated, at the cost of somewhat larger files
+PNG_KW = {'pil_kwargs': {'compress_level': 1}}
 
-# Read topic_comparison.csv
-rows = []
-with IN.open('r', encoding='utf-8') as f:
-    reader = csv.DictReader(f, delimiter='\t')
-    for r in reader:
-        rows.append(r)
+# Read topic_comparison.csv into typed columns; cells that don't parse become
+# NaN, as the old per-row float()/int() fallbacks skipped them. Topic and model
+# names are kept verbatim (a topic called "NA" or "None" is still a topic), so
+# NA parsing is limited to the numeric columns
+OBS_COLS = [f'obs_{i}' for i in range(1, 10)]
+NUM_COLS = ['chi2', 'n_numbers', 'zipf_slope', *OBS_COLS]
+df = pd.read_csv(IN, sep='\t', dtype={'topic': str, 'model': str},
+                 keep_default_na=False, na_values={col: [''] for col in NUM_COLS})
+for col in NUM_COLS:
+    df[col] = pd.to_numeric(df[col], errors='coerce') if col in df else np.nan
 
 # collect topics and models
-topics = sorted(set(r['topic'] for r in rows))
-models = sorted(set(r['model'] for r in rows))
+agg = df.groupby('topic')[OBS_COLS + ['n_numbers']].sum()
+topics = agg.index.tolist()
+models = sorted(df['model'].unique())
 
-# prepare chi2 matrix
-chi2 = {t: {m: None for m in models} for t in topics}
-# prepare per-topic digit obs sums
-per_topic_digits = {t: [0]*9 for t in topics}
-per_topic_n_numbers = {t: 0 for t in topics}
-for r in rows:
-    t = r['topic']
-    m = r['model']
-    try:
-        chi = float(r['chi2']) if r['chi2'] else None
-    except:
-        chi = None
-    chi2[t][m] = chi
-    # obs_1..obs_9 may exist
-    for i in range(1,10):
-        key = f'obs_{i}'
-        if key in r and r[key] != '':
-            try:
-                per_topic_digits[t][i-1] += int(r[key])
-            except:
-                pass
-    try:
-        per_topic_n_numbers[t] += int(r.get('n_numbers') or 0)
-    except:
-        pass
+# per-topic digit obs sums (topics x 9) and number counts; int32/float32 are
+# plenty for counts and plotted chi2 values and halve the bytes handed on
+per_topic_digits = agg[OBS_COLS].to_numpy(dtype=np.int32)
+per_topic_n_numbers = agg['n_numbers'].to_numpy(dtype=np.int64)
+# topics x models chi2 matrix; NaN where a topic/model pair has no value
+chi2_mat = (
+    df.pivot_table(index='topic', columns='model', values='chi2', aggfunc='last')
+    .reindex(index=topics, columns=models)
+    .to_numpy(dtype=np.float32)
+)
 
 # Create chi2 heatmap
 try:
-    import numpy as np
-    import matplotlib.pyplot as plt
     fig, ax = plt.subplots(figsize=(max(6, len(models)*1.2), max(6, len(topics)*0.6)))
-    mat = np.zeros((len(topics), len(models)))
-    mask = np.zeros_like(mat, dtype=bool)
-    for i,t in enumerate(topics):
-        for j,m in enumerate(models):
-            v = chi2[t].get(m)
-            if v is None:
-                mat[i,j] = 0.0
-                mask[i,j] = True
-            else:
-                mat[i,j] = v
-    # log-scale for color mapping to handle large chi2 range
-    import numpy.ma as ma
-    mat_masked = ma.masked_array(mat, mask=mask)
-    # use symmetric log scaling
-    from matplotlib.colors import LogNorm
-    # add small epsilon
+    mask = np.isnan(chi2_mat)
+    # log-scale for color mapping to handle large chi2 range; pcolormesh
+    # leaves NaN cells blank, so no masked array is needed
+    valid = chi2_mat[~mask]
+    # add small epsilon to avoid zeros in min
     eps = 1e-8
-    vmin = max(mat_masked.min(), eps)
-    # to avoid zeros in min
-    im = ax.imshow(mat_masked, aspect='auto', cmap='viridis', norm=LogNorm(vmin=vmin, vmax=max(mat_masked.max(), vmin)))
+    vmin = max(valid.min(), eps) if valid.size else eps
+    vmax = max(valid.max(), vmin) if valid.size else vmin
+    # cell edges at -0.5 .. n-0.5 keep the cells centred on the integer ticks
+    im = ax.pcolormesh(np.arange(len(models) + 1) - 0.5, np.arange(len(topics) + 1) - 0.5, chi2_mat,
+                       cmap='viridis', norm=LogNorm(vmin=vmin, vmax=vmax), shading='flat')
+    # rows top to bottom, as imshow drew them
+    ax.invert_yaxis()
     ax.set_yticks(list(range(len(topics))))
     ax.set_yticklabels(topics)
     ax.set_xticks(list(range(len(models))))
@@ -85,9 +74,9 @@ try:
     ax.set_title('Chi-square (Benford) heatmap by Topic (rows) and Model (cols)')
     cbar = fig.colorbar(im, ax=ax)
     cbar.set_label('chi2 (log scale)')
-    plt.tight_layout()
+    fig.tight_layout()
     out_chi = OUT_DIR / 'chi2_heatmap.png'
-    plt.savefig(out_chi, dpi=150)
+    fig.savefig(out_chi, dpi=150, **PNG_KW)
     plt.close(fig)
     print('Wrote', out_chi)
 except Exception as e:
@@ -95,9 +84,13 @@ except Exception as e:
 
 # Create benford per-topic subplots (observed freq vs expected)
 try:
-    import matplotlib.pyplot as plt
-    import numpy as np
-    BENFORD = [log10(1 + 1.0/d) for d in range(1,10)]
+    BENFORD = np.log10(1.0 + 1.0/np.arange(1,10))
+    benford_max = BENFORD.max()
+    # observed leading-digit frequencies for every topic in one divide;
+    # topics without numbers keep an all-zero row
+    digits = per_topic_digits.astype(np.float32)
+    totals = digits.sum(axis=1, keepdims=True)
+    obs_freq_mat = np.divide(digits, totals, out=np.zeros_like(digits), where=totals > 0)
     n_topics = len(topics)
     ncols = 3
     nrows = (n_topics + ncols - 1)//ncols
@@ -105,25 +98,20 @@ try:
     axes = axes.flatten()
     for idx, t in enumerate(topics):
         ax = axes[idx]
-        obs = per_topic_digits[t]
-        total = sum(obs)
-        if total > 0:
-            obs_freq = [o/total for o in obs]
-        else:
-            obs_freq = [0]*9
+        obs_freq = obs_freq_mat[idx]
         ax.bar(range(1,10), obs_freq, label='observed', alpha=0.7)
         ax.plot(range(1,10), BENFORD, color='C1', marker='o', linestyle='--', label='Benford expected')
         ax.set_xticks(range(1,10))
-        ax.set_ylim(0, max(max(obs_freq)*1.2, max(BENFORD)*1.2))
-        ax.set_title(f'{t} (n_numbers={per_topic_n_numbers.get(t,0)})')
+        ax.set_ylim(0, max(obs_freq.max(), benford_max) * 1.2)
+        ax.set_title(f'{t} (n_numbers={per_topic_n_numbers[idx]})')
         ax.legend()
     # hide leftover axes
     for j in range(len(topics), len(axes)):
         axes[j].axis('off')
-    plt.suptitle('Observed leading-digit frequencies per topic (vs Benford)')
-    plt.tight_layout(rect=[0,0,1,0.97])
+    fig.suptitle('Observed leading-digit frequencies per topic (vs Benford)')
+    fig.tight_layout(rect=[0,0,1,0.97])
     out_ben = OUT_DIR / 'benford_by_topic_combined.png'
-    plt.savefig(out_ben, dpi=150)
+    fig.savefig(out_ben, dpi=150, **PNG_KW)
     plt.close(fig)
     print('Wrote', out_ben)
 except Exception as e:
@@ -133,40 +121,22 @@ print('Done')
 
 # Additionally create a Zipf slope heatmap (topics x models) if zipf_slope data is present
 try:
-    import numpy as np
-    import matplotlib.pyplot as plt
-    from matplotlib.colors import Normalize
-
     # collect zipf slopes into matrix
-    mat_z = np.zeros((len(topics), len(models)), dtype=float)
-    mask_z = np.zeros_like(mat_z, dtype=bool)
-    any_zipf = False
-    for i, t in enumerate(topics):
-        for j, m in enumerate(models):
-            # find the row matching topic/model
-            val = None
-            for r in rows:
-                if r['topic'] == t and r['model'] == m:
-                    try:
-                        val = float(r.get('zipf_slope')) if r.get('zipf_slope') not in (None, '', 'None') else None
-                    except:
-                        val = None
-                    break
-            if val is None:
-                mat_z[i, j] = 0.0
-                mask_z[i, j] = True
-            else:
-                mat_z[i, j] = val
-                any_zipf = True
+    mat_z = (
+        df.pivot_table(index='topic', columns='model', values='zipf_slope', aggfunc='first')
+        .reindex(index=topics, columns=models)
+        .to_numpy(dtype=float)
+    )
+    mask_z = np.isnan(mat_z)
+    mat_z = np.where(mask_z, 0.0, mat_z)
+    any_zipf = bool((~mask_z).any())
 
     if any_zipf:
-        import numpy.ma as ma
         mat_masked_z = ma.masked_array(mat_z, mask=mask_z)
         fig, ax = plt.subplots(figsize=(max(6, len(models)*1.2), max(6, len(topics)*0.6)))
         # compute robust vmin/vmax ignoring masked cells
         try:
-            import numpy as _np
-            valid = _np.ma.masked_array(mat_z, mask=mask_z)
+            valid = ma.masked_array(mat_z, mask=mask_z)
             vmin = float(valid.min())
             vmax = float(valid.max())
         except Exception:
@@ -177,7 +147,6 @@ try:
             vmin -= pad
             vmax += pad
         # choose a diverging colormap and set bad (masked) color to light gray
-        from matplotlib.colors import Normalize
         cmap = plt.get_cmap('RdYlBu')
         cmap.set_bad(color='#DDDDDD')
         im = ax.imshow(mat_masked_z, aspect='auto', cmap=cmap, norm=Normalize(vmin=vmin, vmax=vmax))
@@ -198,9 +167,9 @@ try:
                         pass
         cbar = fig.colorbar(im, ax=ax)
         cbar.set_label('zipf_slope (log-log fit)')
-        plt.tight_layout()
+        fig.tight_layout()
         out_z = OUT_DIR / 'zipf_slope_heatmap.png'
-        plt.savefig(out_z, dpi=200)
+        fig.savefig(out_z, dpi=200, **PNG_KW)
         plt.close(fig)
         print('Wrote', out_z)
     else:
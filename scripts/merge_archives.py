@@ -1,16 +1,42 @@
 #!/usr/bin/env python3
 """
-Merge all files under archive/ into a single timestamped directory, deduplicate by content (SHA-256),
-and avoid overwriting by renaming conflicts. Does not run git; file system operations only.
+Merge all files under archive/ into a single timestamped directory, deduplicate by content
+(BLAKE3 if the blake3 package is installed, else SHA-256), and avoid overwriting by renaming
+conflicts. Does not run git; file system operations only.
 
 Usage: python scripts/merge_archives.py
 """
+import errno
 import hashlib
+import os
 import shutil
+from concurrent.futures import ThreadPoolExecutor
 from pathlib import Path
 import sys
+from collections import Counter
 from datetime import datetime
 
+
+try:
+    # optional: several times faster than SHA-256 and just as safe for dedup
+    import blake3
+except ImportError:
+    blake3 = None
+
+
+def content_digest(p: Path) -> str:
+    """Return the hex digest (BLAKE3 or SHA-256) of a file's contents."""
+    with p.open('rb') as f:
+        if blake3 is None and hasattr(hashlib, 'file_digest'):
+            # Python 3.11+: hashes straight from the file's buffer without a
+            # Python-level read loop
+            return hashlib.file_digest(f, 'sha256').hexdigest()
+        h = blake3.blake3() if blake3 is not None else hashlib.sha256()
+        for chunk in iter(lambda: f.read(1 << 20), b''):
+            h.update(chunk)
+        return h.hexdigest()
+
+
 ROOT = Path('archive')
 if not ROOT.exists():
     print('No archive/ directory found.')
@@ -20,65 +46,88 @@ ts = datetime.utcnow().strftime('archive_merged_%Y%m%d_%H%M%S_utc')
 TARGET = ROOT / ts
 TARGET.mkdir(parents=True, exist_ok=True)
 
-hash_map = {}  # sha256 -> target_path
+hash_map = {}  # content digest -> target_path
 moved = 0
 skipped_dup = 0
 renamed = 0
 
+
+def _walk(root):
+    """Yield ``(path, size)`` for files under ``root``, skipping TARGET.
+
+    Same order as ``Path.rglob('*')``: a directory's files, then its
+    subdirectories depth-first. ``DirEntry`` already knows its type, so
+    only the size needs a ``stat``.
+    """
+    with os.scandir(root) as it:
+        entries = list(it)
+    subdirs = []
+    for e in entries:
+        if e.is_dir(follow_symlinks=False):
+            if e.path != str(TARGET):
+                subdirs.append(e.path)
+        elif e.is_file():
+            yield Path(e.path), e.stat().st_size
+    for d in subdirs:
+        yield from _walk(d)
+
+
 # Walk tree and collect files to move (skip the TARGET dir itself)
-all_files = [p for p in ROOT.rglob('*') if p.is_file() and TARGET not in p.parents]
+entries = list(_walk(ROOT))
+all_files = [p for p, _ in entries]
+# a file whose size no other file shares can't be a duplicate, so only files
+# in same-size groups are hashed; their digest stays None
+size_counts = Counter(size for _, size in entries)
 
-for p in all_files:
+# hash in a thread pool (hashlib releases the GIL while digesting); the
+# dedup/rename/move decisions below stay serial so hash_map is consistent,
+# and only wait for each file's digest when they reach it
+pool = ThreadPoolExecutor(max_workers=min(32, (os.cpu_count() or 1) * 4))
+digests = [pool.submit(content_digest, p) if size_counts[size] > 1 else None for p, size in entries]
+
+for p, fut in zip(all_files, digests):
     try:
-        # compute hash
-        h = hashlib.sha256()
-        with p.open('rb') as f:
-            for chunk in iter(lambda: f.read(8192), b''):
-                h.update(chunk)
-        digest = h.hexdigest()
-        if digest in hash_map:
+        digest = fut.result() if fut is not None else None
+        if digest is not None and digest in hash_map:
             # duplicate by content: remove original file
             print(f'DUPLICATE: {p} (same as {hash_map[digest]}) -- removing original')
             p.unlink()
             skipped_dup += 1
             continue
-        # not seen: determine target name
-        target_name = p.name
-        dest = TARGET / target_name
-        # if filename exists but content differs (shouldn't happen because we check digest map), rename
+        # not seen: determine target name. Every content duplicate was caught
+        # above (a file of unique size has no duplicate), so a name clash here
+        # is always a different file and just needs a free name
+        dest = TARGET / p.name
         suffix = 1
         while dest.exists():
-            # check if same content (unlikely since digest not in map); if different, rename
-            # compute existing file digest
-            eh = hashlib.sha256()
-            with dest.open('rb') as ef:
-                for chunk in iter(lambda: ef.read(8192), b''):
-                    eh.update(chunk)
-            if eh.hexdigest() == digest:
-                # same content as existing dest
-                print(f'FOUND EQUIVALENT TARGET: {p} == {dest} -- removing original')
-                p.unlink()
-                skipped_dup += 1
-                break
-            # else pick a new name
             dest = TARGET / f"{p.stem}_dup{suffix}{p.suffix}"
             suffix += 1
-        else:
-            # move file
+        if suffix > 1:
+            renamed += 1
+        # move file; TARGET is inside archive/, so this is a same-filesystem
+        # rename unless part of archive/ is mounted from elsewhere
+        try:
+            os.replace(p, dest)
+        except OSError as e:
+            if e.errno != errno.EXDEV:
+                raise
             shutil.move(str(p), str(dest))
+        if digest is not None:
             hash_map[digest] = dest
-            moved += 1
+        moved += 1
     except Exception as e:
         print(f'ERROR processing {p}: {e}')
+pool.shutdown()
 
-# cleanup: remove empty dirs under archive (except TARGET)
-for d in sorted(ROOT.iterdir(), reverse=True):
+# cleanup: remove empty dirs under archive (except TARGET), bottom-up so that
+# nested directories emptied by the moves go too. The listing is taken before
+# the children are removed, so just try rmdir: it fails on non-empty dirs
+for dirpath, _, _ in os.walk(ROOT, topdown=False):
+    if dirpath in (str(ROOT), str(TARGET)):
+        continue
     try:
-        if d == TARGET:
-            continue
-        if d.is_dir() and not any(d.iterdir()):
-            d.rmdir()
-    except Exception:
+        os.rmdir(dirpath)
+    except OSError:
         pass
 
 print('\nDone.')
@@ -1,13 +1,16 @@
 import sys
 import os
+import json
 import argparse
+import asyncio
 from typing import List
 
 # Add project root to path
 sys.path.append(os.path.abspath(os.path.join(os.path.dirname(__file__), '..')))
 
-from llm_verification.collector import collect_openai, save_jsonl
-from llm_verification.analyzer_benford import extract_numbers_from_text, first_digits, benford_chi_squared
+from llm_verification.collector import collect_openai_async, save_jsonl
+from llm_verification.analyzer_benford import first_digits_by_text, benford_chi_squared
+from llm_verification.disk_cache import DiskCache, make_key
 
 def main():
     parser = argparse.ArgumentParser(description="Run temperature comparison experiment")
@@ -15,6 +18,9 @@ def main():
     parser.add_argument('--model', type=str, default='gpt-4o', help='Model to use')
     parser.add_argument('--out', type=str, default='outputs/temperature_experiment.csv', help='Output CSV summary')
     parser.add_argument('--dry-run', action='store_true', help='Dry run without API calls')
+    parser.add_argument('--workers', type=int, default=16, help='Max API requests in flight across all temperatures')
+    parser.add_argument('--cache', type=str, default='outputs/.cache/llm_cache.sqlite', help='Response cache reused across reruns')
+    parser.add_argument('--no-cache', action='store_true', help='Always call the API and do not store responses')
     args = parser.parse_args()
 
     # Define temperatures to test
@@ -35,37 +41,78 @@ def main():
 
     print(f"Starting experiment with {len(prompts)} prompts across temperatures: {temperatures}")
     
-    all_results = []
-    
+    import numpy as np
     import pandas as pd
-    
-    for temp in temperatures:
-        print(f"Collecting for temperature={temp}...")
-        results = collect_openai(prompts, model=args.model, temperature=temp, dry_run=args.dry_run)
-        
-        # Analyze immediately
-        for res in results:
-            text = res.get('response')
-            if not text:
+
+    # one column per field, filled by index; rows without a response are
+    # dropped by truncating to n_rows at the end
+    n_slots = len(temperatures) * len(prompts)
+    temps = np.empty(n_slots, dtype=np.float32)
+    prompts_short = [None] * n_slots
+    n_nums = np.empty(n_slots, dtype=np.int32)
+    chi2s = np.full(n_slots, np.nan)
+    pvals = np.full(n_slots, np.nan)
+    n_rows = 0
+
+    # serve (model, prompt, temperature) triples answered by an earlier run
+    # from the cache and only send the rest
+    cache = None if args.no_cache or args.dry_run else DiskCache(args.cache)
+    results_by_temp = [[None] * len(prompts) for _ in temperatures]
+    missing = []  # per temperature: indices of prompts still to collect
+    for temp, results in zip(temperatures, results_by_temp):
+        todo = []
+        for i, p in enumerate(prompts):
+            cached = cache.get(make_key(args.model, p, temp)) if cache is not None else None
+            if cached is not None:
+                results[i] = json.loads(cached)
+            else:
+                todo.append(i)
+        missing.append(todo)
+    n_missing = sum(len(todo) for todo in missing)
+
+    async def collect_all():
+        # every (temperature, prompt) request is independent: fan them all out
+        # at once under one concurrency cap instead of one temperature at a time
+        sem = asyncio.Semaphore(max(1, min(args.workers, n_missing)))
+        return await asyncio.gather(*(
+            collect_openai_async([prompts[i] for i in todo], model=args.model, temperature=temp,
+                                 dry_run=args.dry_run, sem=sem)
+            for temp, todo in zip(temperatures, missing) if todo
+        ))
+
+    print(f"Collecting for temperatures={temperatures} ({n_slots - n_missing} cached)...")
+    if n_missing:
+        collected = iter(asyncio.run(collect_all()))
+        for results, todo in zip(results_by_temp, missing):
+            if not todo:
                 continue
-                
-            nums = extract_numbers_from_text(text)
-            fd = first_digits(nums)
-            chi2 = None
-            p_val = None
-            if len(fd) >= 10:
-                chi2, p_val, _, _ = benford_chi_squared(fd)
-            
-            all_results.append({
-                "temperature": temp,
-                "prompt": res['prompt'][:50] + "...",
-                "n_numbers": len(nums),
-                "chi2": chi2,
-                "p_value": p_val
-            })
+            for i, res in zip(todo, next(collected)):
+                results[i] = res
+                # failed or empty calls are not cached so the next run retries them
+                if cache is not None and res.get('response') and not res.get('error'):
+                    cache.put(make_key(args.model, prompts[i], res['temperature']), json.dumps(res, ensure_ascii=False))
+
+    # Analyze once everything is back: one batched number/first-digit pass
+    # over all responses, then a chi-square test per response
+    answered = [(temp, res) for temp, results in zip(temperatures, results_by_temp)
+                for res in results if res.get('response')]
+    n_per_text, fds = first_digits_by_text([res['response'] for _, res in answered])
+    for (temp, res), n, fd in zip(answered, n_per_text, fds):
+        if len(fd) >= 10:
+            chi2s[n_rows], pvals[n_rows], _, _ = benford_chi_squared(fd)
+        temps[n_rows] = temp
+        prompts_short[n_rows] = res['prompt'][:50] + "..."
+        n_nums[n_rows] = n
+        n_rows += 1
 
     # Save summary
-    df = pd.DataFrame(all_results)
+    df = pd.DataFrame({
+        "temperature": temps[:n_rows],
+        "prompt": prompts_short[:n_rows],
+        "n_numbers": n_nums[:n_rows],
+        "chi2": chi2s[:n_rows],
+        "p_value": pvals[:n_rows],
+    })
     print("\nExperiment Results Summary:")
     print(df.groupby("temperature")[["chi2", "p_value"]].mean())
     
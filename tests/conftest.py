@@ -6,12 +6,30 @@ ROOT = os.path.abspath(os.path.join(os.path.dirname(__file__), '..'))
 if ROOT not in sys.path:
     sys.path.insert(0, ROOT)
 
-import json
+import functools
 from pathlib import Path
 import pytest
 
 from llm_verification import utils
 
+FIXTURES = Path(__file__).parent / 'fixtures'
+
+
+@functools.lru_cache(maxsize=None)
+def _parse(path_str):
+    # parsed once per session; fixtures are read-only test data
+    out = []
+    for rec in utils.read_jsonl(path_str):
+        resp = rec.get('response', '')
+        numbers, cleaned = utils.split_response_to_numbers_and_text(resp)
+        out.append({
+            'id': rec.get('id'),
+            'model': rec.get('model'),
+            'numbers': numbers,
+            'cleaned': cleaned,
+        })
+    return out
+
 
 @pytest.fixture
 def parsed_from_fixture():
@@ -24,18 +42,8 @@ def parsed_from_fixture():
         p = Path(fixture_path)
         if not p.exists():
             # try relative to tests/fixtures
-            p = Path(__file__).parent / 'fixtures' / fixture_path
-        data = utils.read_jsonl(str(p))
-        out = []
-        for rec in data:
-            resp = rec.get('response', '')
-            numbers, cleaned = utils.split_response_to_numbers_and_text(resp)
-            out.append({
-                'id': rec.get('id'),
-                'model': rec.get('model'),
-                'numbers': numbers,
-                'cleaned': cleaned,
-            })
-        return out
+            p = FIXTURES / fixture_path
+        # copies, so a test mutating its records can't leak into the next one
+        return [dict(r, numbers=list(r['numbers'])) for r in _parse(str(p.resolve()))]
 
     return _factory
@@ -1,4 +1,4 @@
-from llm_verification.analyzer_benford import extract_numbers_from_text, first_digits, benford_chi_squared
+from llm_verification.analyzer_benford import extract_numbers_from_text, extract_numbers_from_texts, first_digits, first_digits_by_text, benford_chi_squared
 
 
 def test_benford_small():
@@ -9,3 +9,54 @@ def test_benford_small():
     assert counts.sum() == 5
     assert len(counts) == 9
 
+
+def test_first_digits_decimals_and_separators():
+    fd = first_digits(['0.3', '0.023', '1,234.5', '999', '0', '10'])
+    assert fd.tolist() == [3, 2, 1, 9, 1]
+
+
+def test_first_digits_long_values_and_exponents():
+    assert first_digits(['9,999,999,999.99', '19,999,999,999.99', '1e5', '0e5', '0.05E-3']).tolist() == [9, 1, 1, 5]
+    assert first_digits([9999999999.99, 0.3, 0.0, 1e23]).tolist() == [9, 3, 1]
+
+
+def test_extract_numbers_from_texts_keeps_texts_apart():
+    texts = ['total 12', '34 items, 1,200.5 each', '', '7']
+    expected = [n for t in texts for n in extract_numbers_from_text(t)]
+    assert extract_numbers_from_texts(texts) == expected == ['12', '34', '1,200.5', '7']
+
+
+def test_first_digits_by_text_matches_per_text_calls():
+    texts = ['total 12 and 0.05', '', 'none here', '1,234.5 then 0 and 007', '9']
+    n_numbers, fds = first_digits_by_text(texts)
+    assert n_numbers.tolist() == [len(extract_numbers_from_text(t)) for t in texts] == [2, 0, 0, 3, 1]
+    assert [fd.tolist() for fd in fds] == [[1, 5], [], [], [1, 7], [9]]
+
+
+def test_first_digits_floats_round_to_15_significant_digits():
+    # same digits as format(x, '.15g'): 15-digit values keep their digit
+    assert first_digits([6.99999999999999, 9.99999999999999, 0.0003]).tolist() == [6, 9, 3]
+    # the 16th+ digits sit right at the rounding boundary '.15g' resolves down
+    assert first_digits([4.999999999999995e+58]).tolist() == [4]
+
+
+def test_first_digits_subnormals():
+    assert first_digits([5e-324, 2.5e-310]).tolist() == [4, 2]
+    chi2, p, counts, expected = benford_chi_squared(first_digits([5e-324, 1.0]))
+    assert counts.sum() == 2
+
+
+def test_first_digits_by_text_nul_inside_a_text():
+    n_numbers, fds = first_digits_by_text(['a 12\x00 34', '56'])
+    assert n_numbers.tolist() == [2, 1]
+    assert [fd.tolist() for fd in fds] == [[1, 3], [5]]
+
+
+def test_first_digits_non_ascii_digits():
+    # \d also matches other scripts' decimal digits; they count like ASCII ones
+    text = 'Arabic-Indic ٣٤ and ١٢٠, Devanagari ७, plain 0.5 and 8'
+    nums = extract_numbers_from_text(text)
+    assert first_digits(nums).tolist() == [3, 1, 7, 5, 8]
+    n_numbers, fds = first_digits_by_text([text, 'ü 2'])
+    assert n_numbers.tolist() == [5, 1]
+    assert [fd.tolist() for fd in fds] == [[3, 1, 7, 5, 8], [2]]
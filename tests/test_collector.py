@@ -23,3 +23,41 @@ def test_collect_parallel_dryrun():
     recs = collect_openai_parallel(prompts, dry_run=True, max_workers=3)
     assert len(recs) == 3
     assert all('prompt' in r and 'timestamp' in r for r in recs)
+
+
+def test_collect_async_retries_and_keeps_order():
+    import asyncio
+    from types import SimpleNamespace
+    from llm_verification.collector import _collect_single_async
+
+    class FakeCompletions:
+        def __init__(self):
+            self.calls = {}
+
+        async def create(self, model, messages, temperature):
+            prompt = messages[0]['content']
+            self.calls[prompt] = self.calls.get(prompt, 0) + 1
+            # the first prompt returns an empty response once before succeeding
+            text = '' if prompt == 'p1' and self.calls[prompt] == 1 else f'answer to {prompt}'
+            return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=text))])
+
+    completions = FakeCompletions()
+    client = SimpleNamespace(chat=SimpleNamespace(completions=completions))
+
+    async def run():
+        sem = asyncio.Semaphore(2)
+        return await asyncio.gather(*(
+            _collect_single_async(client, p, 'm', 0.5, sem, max_retries=3, sleep_between=0.0)
+            for p in ['p1', 'p2', 'p3']
+        ))
+
+    recs = asyncio.run(run())
+    assert [r['response'] for r in recs] == ['answer to p1', 'answer to p2', 'answer to p3']
+    assert completions.calls['p1'] == 2
+
+
+def test_collect_async_dryrun():
+    import asyncio
+    from llm_verification.collector import collect_openai_async
+    recs = asyncio.run(collect_openai_async(['p1', 'p2'], dry_run=True))
+    assert [r['prompt'] for r in recs] == ['p1', 'p2']
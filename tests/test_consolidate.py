@@ -0,0 +1,45 @@
+import importlib.util
+from pathlib import Path
+
+import numpy as np
+
+from llm_verification.analyzer_benford import first_digits
+
+_spec = importlib.util.spec_from_file_location(
+    'consolidate', Path(__file__).resolve().parents[1] / 'scripts' / 'consolidate.py')
+consolidate = importlib.util.module_from_spec(_spec)
+_spec.loader.exec_module(consolidate)
+
+
+def _leading_digit_15g(n):
+    # consolidate's original per-number digit, which the topic CSV is built on
+    s = f"{abs(n):.15g}".lstrip('0').lstrip('.')
+    for ch in s:
+        if ch.isdigit() and ch != '0':
+            return int(ch)
+    return None
+
+
+def _boundary_values():
+    vals = []
+    for d in range(1, 10):
+        for e in range(-320, 308, 7):
+            x = float(f'{d}e{e}')
+            # the floats just below each digit boundary, where rounding decides
+            for _ in range(12):
+                x = np.nextafter(x, 0)
+                vals.append(float(x))
+    vals += [4.999999999999995e+58, 6.99999999999999, 9.99999999999999, 1e23, 0.0003, 5e-324]
+    return [v for v in vals if v != 0]
+
+
+def test_first_digits_matches_15g_digit_at_boundaries():
+    vals = _boundary_values()
+    assert first_digits(vals).tolist() == [_leading_digit_15g(v) for v in vals]
+
+
+def test_consolidate_record_digits_match_15g_digit():
+    text = 'Totals: $1,200.50, 4.999999999999995e58, 6.99999999999999, 0, 0.0003 and 9.99999999999999'
+    nums = consolidate.extract_numbers(text)
+    expected = [d for d in map(_leading_digit_15g, nums) if d is not None]
+    assert first_digits(nums).tolist() == expected == [1, 4, 6, 3, 9]
@@ -0,0 +1,32 @@
+from llm_verification.disk_cache import DiskCache, make_key
+
+
+def test_disk_cache_roundtrip_and_persist(tmp_path):
+    path = str(tmp_path / 'cache.sqlite')
+    key = make_key('gpt-4o', 'hello', 1.0)
+    assert key != make_key('gpt-4o', 'hello', 0.5)
+    cache = DiskCache(path)
+    assert cache.get(key) is None
+    cache.put(key, '{"response": "hi"}')
+    assert DiskCache(path).get(key) == '{"response": "hi"}'
+
+
+def test_disk_cache_evicts_least_recently_used(tmp_path):
+    cache = DiskCache(str(tmp_path / 'cache.sqlite'), max_entries=2)
+    cache.put('a', '1')
+    cache.put('b', '2')
+    cache.get('a')
+    cache.put('c', '3')
+    assert len(cache) == 2
+    assert cache.get('b') is None
+    assert cache.get('a') == '1'
+
+
+def test_disk_cache_ttl_applies_to_an_open_cache(tmp_path, monkeypatch):
+    import time
+    cache = DiskCache(str(tmp_path / 'cache.sqlite'), ttl=60)
+    cache.put('a', '1')
+    assert cache.get('a') == '1'
+    now = time.time()
+    monkeypatch.setattr(time, 'time', lambda: now + 61)
+    assert cache.get('a') is None
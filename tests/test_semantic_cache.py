@@ -0,0 +1,70 @@
+import numpy as np
+from llm_verification.semantic_cache import SemanticCache
+
+
+def _fake_embed(text):
+    # bag-of-letters embedding: similar wording -> similar vectors
+    v = np.zeros(26, dtype=np.float32)
+    for ch in text.lower():
+        if 'a' <= ch <= 'z':
+            v[ord(ch) - ord('a')] += 1
+    return v
+
+
+def test_semantic_cache_hit_and_persist(tmp_path):
+    path = str(tmp_path / 'cache.npz')
+    calls = []
+
+    def compute(prompts, model, temperature):
+        calls.append(prompts[0])
+        return [{"prompt": prompts[0], "response": "resp", "model": model, "temperature": temperature}]
+
+    cache = SemanticCache(path, embed_fn=_fake_embed)
+    r1 = cache.get_or_compute('Write a story about a robot', 'm', 1.0, compute)
+    r2 = cache.get_or_compute('Write a story about the robot', 'm', 1.0, compute)
+    assert r1 == r2
+    assert len(calls) == 1
+    # different temperature is never a hit
+    cache.get_or_compute('Write a story about a robot', 'm', 0.5, compute)
+    assert len(calls) == 2
+
+    reloaded = SemanticCache(path, embed_fn=_fake_embed)
+    assert len(reloaded) == 2
+    assert reloaded.get('Write a story about a robot', 'm', 1.0)['response'] == 'resp'
+
+
+def test_semantic_cache_skips_errors(tmp_path):
+    cache = SemanticCache(str(tmp_path / 'cache.npz'), embed_fn=_fake_embed)
+
+    def compute(prompts, model, temperature):
+        return [{"prompt": prompts[0], "response": None, "model": model, "error": "boom"}]
+
+    rec = cache.get_or_compute('hello', 'm', 1.0, compute)
+    assert rec['error'] == 'boom'
+    assert len(cache) == 0
+
+
+def test_semantic_cache_embed_failure_falls_through(tmp_path):
+    def broken_embed(text):
+        raise RuntimeError('rate limited')
+
+    cache = SemanticCache(str(tmp_path / 'cache.npz'), embed_fn=broken_embed)
+
+    def compute(prompts, model, temperature):
+        return [{"prompt": prompts[0], "response": "resp", "model": model, "temperature": temperature}]
+
+    assert cache.get_or_compute('hello', 'm', 1.0, compute)['response'] == 'resp'
+    assert len(cache) == 0
+
+
+def test_semantic_cache_concurrent_adds(tmp_path):
+    from concurrent.futures import ThreadPoolExecutor
+    path = str(tmp_path / 'cache.npz')
+    cache = SemanticCache(path, embed_fn=_fake_embed)
+    prompts = [f'prompt {chr(97 + i % 26) * (i + 1)}' for i in range(40)]
+    with ThreadPoolExecutor(8) as pool:
+        list(pool.map(lambda p: cache.add(p, 'm', 1.0, {'response': p}), prompts))
+    assert cache.E.shape[0] == len(cache.norms) == len(cache) == 40
+    reloaded = SemanticCache(path, embed_fn=_fake_embed)
+    assert sorted(e['prompt'] for e in reloaded.entries) == sorted(prompts)
+    assert list(tmp_path.iterdir()) == [tmp_path / 'cache.npz']
@@ -24,3 +24,10 @@ def test_date_time_removed_and_clean_text():
     assert '2025-09-23' not in txt
     assert '12:34:56' not in txt
     assert 'ABC-12345-678' not in txt
+
+
+def test_read_jsonl_concatenated_and_multiline(tmp_path):
+    from llm_verification.utils import read_jsonl
+    p = tmp_path / 'mixed.jsonl'
+    p.write_text('{"a": 1}\n{"b": 2}{"c": 3}\n{"d":\n 4}\n\n{"e": 5}\n', encoding='utf-8')
+    assert list(read_jsonl(str(p))) == [{"a": 1}, {"b": 2}, {"c": 3}, {"d": 4}, {"e": 5}]
@@ -1,5 +1,9 @@
+import json
+import os
 from pathlib import Path
-from llm_verification.visualize import plot_from_jsonl
+import concurrent.futures
+from llm_verification import visualize
+from llm_verification.visualize import plot_from_jsonl, plot_per_model, export_stats_csv, analyze
 
 
 def test_plot_from_sample(tmp_path):
@@ -8,3 +12,64 @@ def test_plot_from_sample(tmp_path):
     plot_from_jsonl(str(fixture), out_dir=str(outdir))
     assert (outdir / 'benford.png').exists()
     assert (outdir / 'zipf.png').exists()
+
+
+def test_export_stats_csv_parallel_matches_serial(tmp_path, monkeypatch):
+    src = tmp_path / 'two_models.jsonl'
+    with open(src, 'w', encoding='utf-8') as f:
+        for model in ('model-a', 'model-b'):
+            for i in range(5):
+                text = f'In {1900 + 17 * i} the {model} sold {i * 321 + 12} units for ${i * 45.5 + 3} each.'
+                f.write(json.dumps({'model': model, 'response': text}) + '\n')
+    serial = export_stats_csv(str(src), out_csv=str(tmp_path / 'serial.csv'))
+    # the serial run's analysis is cached; drop it so the pool really runs
+    visualize._ANALYSIS_CACHE.clear()
+    pools = []
+
+    class SpyPool(concurrent.futures.ProcessPoolExecutor):
+        def __init__(self, *args, **kwargs):
+            pools.append(self)
+            super().__init__(*args, **kwargs)
+
+    monkeypatch.setattr(concurrent.futures, 'ProcessPoolExecutor', SpyPool)
+    parallel = export_stats_csv(str(src), out_csv=str(tmp_path / 'parallel.csv'), workers=2)
+    assert len(pools) == 1
+    text = Path(parallel).read_text()
+    assert text == Path(serial).read_text()
+    assert text.count('model-') == 2
+
+
+def test_plot_per_model(tmp_path):
+    outdir = tmp_path / 'out'
+    fixture = Path(__file__).parent / 'fixtures' / 'sample_outputs.jsonl'
+    plot_per_model(str(fixture), out_dir=str(outdir))
+    assert (outdir / 'zipf_gpt-test.png').exists()
+    assert (outdir / 'zipf_overlay.png').exists()
+
+
+def test_plot_per_model_parallel(tmp_path):
+    src = tmp_path / 'two_models.jsonl'
+    with open(src, 'w', encoding='utf-8') as f:
+        for model in ('model-a', 'model-b'):
+            for i in range(5):
+                text = f'The {model} run {i} reported {i * 321 + 12} tokens and {1900 + 17 * i} words today.'
+                f.write(json.dumps({'model': model, 'response': text}) + '\n')
+    outdir = tmp_path / 'out'
+    plot_per_model(str(src), out_dir=str(outdir), workers=2)
+    for model in ('model-a', 'model-b'):
+        assert (outdir / f'benford_{model}.png').exists()
+        assert (outdir / f'zipf_{model}.png').exists()
+    assert (outdir / 'zipf_overlay.png').exists()
+
+
+def test_analyze_is_cached_until_file_changes(tmp_path):
+    src = tmp_path / 'one_model.jsonl'
+    src.write_text(json.dumps({'model': 'm', 'response': 'Paid 120 and 345 for 2 items.'}) + '\n', encoding='utf-8')
+    first = analyze(str(src))
+    assert analyze(str(src)) is first
+    with open(src, 'a', encoding='utf-8') as f:
+        f.write(json.dumps({'model': 'm', 'response': 'Then 67 more.'}) + '\n')
+    os.utime(src, ns=(0, 0))
+    second = analyze(str(src))
+    assert second is not first
+    assert second['m']['n_texts'] == 2
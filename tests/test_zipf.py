@@ -3,6 +3,15 @@ from llm_verification.analyzer_zipf import zipf_stats
 
 def test_zipf_small():
     texts = ["apple banana apple orange banana apple"]
-    ranks, freqs, slope = zipf_stats(texts)
+    ranks, freqs, slope, r2 = zipf_stats(texts)
     assert len(freqs) == 3
     assert slope < 0
+
+
+def test_zipf_stats_from_tokens_matches_texts():
+    from llm_verification.analyzer_zipf import tokenize, zipf_stats_from_tokens
+    text = "Apple banana apple orange banana apple"
+    r1, f1, s1, _ = zipf_stats([text])
+    r2, f2, s2, _ = zipf_stats_from_tokens(tokenize(text))
+    assert list(f1) == list(f2) == [3, 2, 1]
+    assert s1 == s2